@@ -1,6 +1,13 @@
+import asyncio
 import tkinter as tk
-from tkinter import messagebox, ttk, filedialog
-import time, os, sys, json, socket, csv
+from tkinter import messagebox, ttk, filedialog, font as tkfont
+import time, os, sys, json, socket, csv, math, tempfile, threading, queue, struct, select, random, zlib
+from bisect import bisect_left, bisect_right
+from collections import deque
+import heapq, cProfile, pstats, io, signal, tracemalloc, re, stat
+from functools import lru_cache
+from examclock_state import StateWriter, DEFAULT_STATE_PATH
+from examclock_catalogue import CatalogueIndex
 from datetime import datetime, timedelta
 
 # Set paths for configuration files.
@@ -11,6 +18,105 @@ else:
 
 LOG_FILE = os.path.join(application_path, "subject_log.json")
 PRE_CONFIG_CSV = os.path.join(application_path, "pre_config.csv")
+PRE_CONFIG_CACHE = os.path.join(application_path, "pre_config.cache.json")
+
+# Layout version of subject_log.json, and the most subject codes remembered in it.
+CONFIG_VERSION = 2
+SUBJECT_LOG_LIMIT = 5000
+
+# String-valued config keys a version 1 file may have nested inside "subject_log"; they are not subject codes.
+CONFIG_STRING_KEYS = ("version", "exam_date", "exam_start_time", "exam_end_time")
+
+# Pre-config sessions listed by default are those within this many days of today.
+PRE_CONFIG_WINDOW_DAYS = 7
+
+# Startup connectivity probe; override with a "time_check" object in subject_log.json.
+TIME_CHECK_DEFAULTS = {"host": "8.8.8.8", "port": 53, "timeout": 1.5}
+
+# SNTP time sync; override with an "sntp" object in subject_log.json (server null disables it).
+SNTP_DEFAULTS = {"server": "pool.ntp.org", "port": 123, "samples": 4, "timeout": 1.0,
+                 "interval": 600, "slew_rate": 0.05, "max_slew": 1.0}
+NTP_EPOCH_OFFSET = 2208988800
+
+# A clock that keeps counting through suspend where the OS has one (Linux), else time.monotonic.
+if hasattr(time, "CLOCK_BOOTTIME"):
+    def monotonic():
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+else:
+    monotonic = time.monotonic
+
+# Simulated time for demos: start ("HH:MM" today or "YYYY-MM-DD HH:MM", null for now) and a warp
+# factor (600 runs a 3-hour session in 18 seconds). Configure with a "virtual_time" object.
+VIRTUAL_TIME_DEFAULTS = {"start": None, "warp": 1.0}
+
+# Leader/follower LAN mode; set "role" in a "lan" object in subject_log.json.
+# Use interface "127.0.0.1" to run a leader and followers over loopback.
+# The leader sends the subject list to each requesting address at most once per reply_interval seconds.
+LAN_DEFAULTS = {"role": None, "group": "239.255.42.99", "port": 50555, "interface": "0.0.0.0",
+                "ttl": 1, "latency": 0.0005, "request_spread": 1.0, "reply_interval": 1.0}
+LAN_MAGIC = b"EXCK"
+LAN_VERSION = 2
+# magic, version, flags (1 = demo, 2 = has session), request port, sequence,
+# leader time, exam start, exam end, subject list version
+LAN_PACKET = struct.Struct("!4sBBHIdddI")
+# The subject list is sent zlib-compressed in datagrams of at most LAN_CHUNK_SIZE bytes, each
+# headed by magic, b"S", subject list version, chunk index and chunk count.
+LAN_CHUNK = struct.Struct("!4scIHH")
+LAN_CHUNK_SIZE = 8192
+
+# Read-only HTTP/SSE status server; enable with a "status_server" object in subject_log.json.
+STATUS_SERVER_DEFAULTS = {"enabled": False, "host": "0.0.0.0", "port": 8765}
+STATUS_PAGE = b"""<!doctype html><html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width">
+<title>Exam Clock</title></head><body style="background:#1a1a1a;color:#fff;font-family:Helvetica,sans-serif">
+<h1 id="clock" style="font-size:20vw;margin:0;color:#ff0">--:--:--</h1><p id="info"></p><pre id="subjects"></pre>
+<script>new EventSource("/events").onmessage = function (e) { var s = JSON.parse(e.data);
+document.getElementById("clock").textContent = s.time_text;
+document.getElementById("info").textContent = s.rooms ? s.rooms.length + " rooms" : s.exam_start_time + " - " + s.exam_end_time +
+  " | " + Math.floor(s.time_remaining / 60) + " min left | " + Math.round(s.progress) + "%";
+document.getElementById("subjects").textContent = JSON.stringify(s.rooms || s.subject_info, null, 1); };</script>
+</body></html>"""
+
+# Live state published for local processes (see examclock_state.py); configure with a "shared_state" object.
+SHARED_STATE_DEFAULTS = {"enabled": True, "path": DEFAULT_STATE_PATH}
+
+# Clock flash alerts; override with an "alerts" object in subject_log.json.
+# Events missed by late ticks still fire if no more than catch_up seconds late.
+ALERT_DEFAULTS = {"minutes_before_end": [30, 15, 5], "exam_end": True, "half_hour_marks": True, "catch_up": 60}
+
+# Hot-path timing histograms; configure with a "metrics" object in subject_log.json.
+# Recent samples are kept per metric and written to dump_path (relative to the app) on exit.
+METRICS_DEFAULTS = {"enabled": True, "samples": 600, "dump_path": "examclock_metrics.json"}
+# Histogram bucket upper bounds in milliseconds; the last bucket catches everything slower.
+METRIC_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Runtime profiling window (help window button, or SIGUSR1 where available); configure with a "profiler" object.
+# Reports are written to directory (relative to the app) when the window ends or profiling is toggled off.
+PROFILER_DEFAULTS = {"duration": 300, "top": 25, "frames": 5, "directory": "profiles"}
+
+# Display settings saved from the settings window as an "appearance" object in subject_log.json.
+# Font sizes default by screen width: (below 1280 px, otherwise).
+APPEARANCE_DEFAULTS = {"flash_count": 6, "flash_delay": 500, "main_bg_color": "#1a1a1a", "header_bg_color": "#2c2c2c",
+                       "clock_fg_color": "#FFFF00", "clock_bg_color": "#000000"}
+FONT_SIZE_DEFAULTS = {"clock_font_size": (80, 140), "info_font_size": (18, 28), "sub_header_font_size": (24, 32),
+                      "custom_font_size": (18, 20), "icon_font_size": (12, 16)}
+
+# Outside exam sessions (plus margin seconds either side) the progress bar and alerts sleep until their
+# next boundary; idle_hide_seconds also drops the clock to HH:MM, repainted once a minute.
+# Configure with a "power_save" object in subject_log.json.
+POWER_SAVE_DEFAULTS = {"enabled": True, "margin": 600, "idle_hide_seconds": False}
+
+# Course catalogue index built by examclock_catalogue.py (path relative to the app); configure with a
+# "catalogue" object. When the file exists, subject autocomplete and name lookup fall back to it.
+CATALOGUE_DEFAULTS = {"path": "subject_catalogue.sqlite"}
+
+# After a pre-config session, the day's later sessions in the same room follow automatically: the
+# switch happens handover seconds after a session ends (or when the next starts, if sooner), and the
+# next subject table is built off-screen prebuild seconds before. Configure with a "sequence" object.
+SEQUENCE_DEFAULTS = {"enabled": True, "handover": 300, "prebuild": 60}
+
+# Progress bar colour bands, keyed by the band names ExamSession reports.
+PROGRESS_BANDS = {"normal": "#2ecc71", "warning": "#f39c12", "critical": "#e74c3c"}
+PROGRESS_BAND_BYTES = {band: color.encode("ascii") for band, color in PROGRESS_BANDS.items()}
 
 
 def show_startup_menu(root, font):
@@ -18,7 +124,7 @@ def show_startup_menu(root, font):
     menu_win = tk.Toplevel(root)
     menu_win.title("Select Configuration")
     menu_win.configure(bg="#333333")
-    menu_win.geometry("400x300")
+    menu_win.geometry("400x380")
     menu_win.transient(root)
     menu_win.lift()
     menu_win.focus_force()
@@ -33,6 +139,8 @@ def show_startup_menu(root, font):
               relief="flat", command=lambda: set_choice("last")).pack(pady=10)
     tk.Button(menu_win, text="Load Pre-Config", font=font, bg="#f39c12", fg="white",
               relief="flat", command=lambda: set_choice("pre")).pack(pady=10)
+    tk.Button(menu_win, text="Multi-Room Displays", font=font, bg="#8e44ad", fg="white",
+              relief="flat", command=lambda: set_choice("rooms")).pack(pady=10)
     root.wait_window(menu_win)
     print("Startup menu closed with choice:", choice["value"])
     return choice["value"]
@@ -79,15 +187,1468 @@ class CreateToolTip:
             tw.destroy()
 
 
+def migrate_config(raw):
+    """
+    Bring a parsed subject_log.json up to CONFIG_VERSION. Version 1 files nested each
+    previous file inside "subject_log"; those levels are flattened into one code map.
+    """
+    if not isinstance(raw, dict):
+        raw = {}
+    subject_log = {}
+    def collect(log):
+        if not isinstance(log, dict):
+            return
+        nested = log.get("subject_log")
+        if isinstance(nested, dict):
+            collect(nested)
+        nested_info = log.get("subject_info")
+        if isinstance(nested_info, list):
+            for entry in nested_info:
+                if isinstance(entry, (list, tuple)) and len(entry) >= 2 and isinstance(entry[1], str):
+                    subject_log.pop(entry[0], None)
+                    subject_log[entry[0]] = entry[1]
+        for code, name in log.items():
+            if code not in ("subject_log", "subject_info") + CONFIG_STRING_KEYS and isinstance(name, str):
+                subject_log.pop(code, None)
+                subject_log[code] = name
+    collect(raw.get("subject_log"))
+    config = {key: value for key, value in raw.items() if key != "subject_log"}
+    config["version"] = CONFIG_VERSION
+    config["subject_info"] = [list(entry) for entry in raw.get("subject_info") or []]
+    config["subject_log"] = subject_log
+    return config
+
+
+# Read once at import, while single-threaded: os.umask() can only be queried by setting it.
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def replacement_mode(path):
+    """
+    Permissions for a temp file about to replace path: path's own, or a new file's under
+    the umask. mkstemp creates files 0600, and os.replace would otherwise carry that over.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~UMASK
+
+
+class ConfigStore:
+    """
+    The authoritative in-memory copy of subject_log.json. Changes are written behind by
+    a background thread that coalesces bursts of edits into one write, always through
+    a temp file and rename so a power cut never leaves a half-written file.
+    """
+    def __init__(self, path, delay=0.5):
+        self.path = path
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.closing = False
+        self.thread = None
+        self.load_error = None
+        self.loaded = False
+        raw = {}
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                raw = json.load(file)
+            self.loaded = True
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError) as e:
+            self.load_error = e
+        self.data = migrate_config(raw)
+    def get(self, key, default=None):
+        with self.lock:
+            return self.data.get(key, default)
+    def subject_log(self):
+        with self.lock:
+            return dict(self.data["subject_log"])
+    def update(self, **values):
+        with self.lock:
+            self.data.update(values)
+        self.save()
+    def remember_subjects(self, subject_info):
+        """Add subjects to the log (keeping known names), most recent last, bounded by SUBJECT_LOG_LIMIT."""
+        with self.lock:
+            subject_log = self.data["subject_log"]
+            for subject_code, subject_name, *_ in subject_info:
+                subject_log[subject_code] = subject_log.pop(subject_code, subject_name)
+            for subject_code in list(subject_log)[:max(0, len(subject_log) - SUBJECT_LOG_LIMIT)]:
+                del subject_log[subject_code]
+        self.save()
+    def save(self):
+        self.dirty.set()
+        if self.thread is None and not self.closing:
+            self.thread = threading.Thread(target=self.run, name="config-writer", daemon=True)
+            self.thread.start()
+    def run(self):
+        # Re-checked after each write: close() may have set dirty just before write() cleared it.
+        while not self.closing:
+            self.dirty.wait()
+            if self.closing:
+                return
+            # Let a burst of edits settle so they cost one write.
+            time.sleep(self.delay)
+            self.write()
+    def write(self):
+        self.dirty.clear()
+        with self.lock:
+            payload = json.dumps(self.data, separators=(",", ":"))
+        directory = os.path.dirname(self.path) or "."
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=".subject_log.", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+            os.chmod(temp_path, replacement_mode(self.path))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print("Error saving configuration:", e)
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+    def close(self):
+        """Stop the writer thread and flush any pending change synchronously."""
+        self.closing = True
+        pending = self.dirty.is_set()
+        self.dirty.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if pending:
+            self.write()
+
+
+class PreConfigIndex:
+    """
+    The pre-config timetable parsed once into sessions sorted by start time, so the
+    session nearest to a moment is a binary search. The parsed form is cached next to
+    the CSV and reused while the CSV's modification time and size are unchanged.
+    Each session is a list:
+    [start epoch or None, date, start time, end time, [[code, name, rows], ...], room].
+    """
+    CACHE_VERSION = 2
+    loaded = {}
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.starts = [session[0] for session in sessions if session[0] is not None]
+    @classmethod
+    def load(cls, csv_path, cache_path=None):
+        stat = os.stat(csv_path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        cached = cls.loaded.get(csv_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        index = None
+        if cache_path:
+            try:
+                with open(cache_path, "r", encoding="utf-8") as file:
+                    cache = json.load(file)
+                if cache.get("version") == cls.CACHE_VERSION and cache.get("signature") == signature:
+                    index = cls(cache["sessions"])
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+        if index is None:
+            index = cls(cls.parse(csv_path))
+            if cache_path:
+                index.write_cache(cache_path, signature)
+        cls.loaded[csv_path] = (signature, index)
+        return index
+    @staticmethod
+    def parse(csv_path):
+        sessions = []
+        with open(csv_path, newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            column = {name: position for position, name in enumerate(header)}
+            # Resolve the SubjectCodeN/SubjectNameN/SubjectRowsN columns once from the header.
+            pairs = [(position, column.get("SubjectName" + name[len("SubjectCode"):]),
+                      column.get("SubjectRows" + name[len("SubjectCode"):]))
+                     for position, name in enumerate(header) if name.startswith("SubjectCode")]
+            def field(row, position):
+                return row[position] if position is not None and position < len(row) else ""
+            date_col, start_col, end_col = column.get("Date"), column.get("ExamStart"), column.get("ExamEnd")
+            room_col = column.get("Room")
+            for row in reader:
+                exam_date, exam_start, exam_end = field(row, date_col), field(row, start_col), field(row, end_col)
+                subjects = []
+                for code_col, name_col, rows_col in pairs:
+                    code, name = field(row, code_col), field(row, name_col)
+                    if code and name:
+                        subjects.append([code, name, field(row, rows_col)])
+                try:
+                    start = datetime.strptime(f"{exam_date} {exam_start}", "%d-%b-%Y %H:%M").timestamp()
+                except ValueError:
+                    start = None
+                sessions.append([start, exam_date, exam_start, exam_end, subjects, field(row, room_col)])
+        # Undated rows keep their file order after the dated ones.
+        sessions.sort(key=lambda session: (session[0] is None, session[0] or 0))
+        return sessions
+    def write_cache(self, cache_path, signature):
+        directory = os.path.dirname(cache_path) or "."
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=".pre_config.", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"version": self.CACHE_VERSION, "signature": signature, "sessions": self.sessions},
+                          file, separators=(",", ":"))
+            os.chmod(temp_path, replacement_mode(cache_path))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print("Could not write pre-config cache:", e)
+    def nearest(self, now):
+        """Index of the dated session starting closest to epoch time now, or 0."""
+        if not self.starts:
+            return 0
+        position = bisect_left(self.starts, now)
+        if position == len(self.starts) or (position > 0 and now - self.starts[position - 1] < self.starts[position] - now):
+            position -= 1
+        return position
+    def day(self, now):
+        """(first, last) session indexes starting on the local date of epoch time now."""
+        midnight = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (bisect_left(self.starts, midnight.timestamp()),
+                bisect_left(self.starts, (midnight + timedelta(days=1)).timestamp()))
+    def window(self, now, days):
+        """(first, last) session indexes starting within days of epoch time now."""
+        span = days * 86400
+        return bisect_left(self.starts, now - span), bisect_right(self.starts, now + span)
+    @staticmethod
+    def as_config(session):
+        _, exam_date, exam_start, exam_end, subjects, room = session
+        return {"exam_date": exam_date, "exam_start_time": exam_start, "exam_end_time": exam_end,
+                "subject_info": [tuple(subject) for subject in subjects], "room": room}
+
+
+class SessionSequence:
+    """
+    The sessions following the current one, compiled into a heap of timed
+    (time, order, kind, config) events: a "prebuild" ahead of each "switch".
+    sessions is a list of (ExamSession, config) pairs in start order, current first.
+    """
+    def __init__(self, sessions, handover=300, prebuild=60):
+        self.heap = []
+        for order, ((previous, _), (session, config)) in enumerate(zip(sessions, sessions[1:])):
+            switch_at = max(previous.end, min(previous.end + handover, session.start))
+            self.heap.append((switch_at - prebuild, 2 * order, "prebuild", config))
+            self.heap.append((switch_at, 2 * order + 1, "switch", config))
+        heapq.heapify(self.heap)
+    def __len__(self):
+        return sum(1 for event in self.heap if event[2] == "switch")
+    def due(self, now):
+        """Pop the (kind, config) events due at now, in order."""
+        fired = []
+        while self.heap and self.heap[0][0] <= now:
+            fired.append(heapq.heappop(self.heap)[2:])
+        return fired
+    def next_time(self):
+        return self.heap[0][0] if self.heap else math.inf
+
+
+class SntpClient:
+    """
+    Minimal SNTP (RFC 4330) client. Several samples are taken and the one with the
+    lowest round-trip delay is kept, since it carries the least queueing error.
+    """
+    def __init__(self, server, port=123, samples=4, timeout=1.0):
+        self.server = server
+        self.port = port
+        self.samples = samples
+        self.timeout = timeout
+    @staticmethod
+    def to_ntp(t):
+        seconds = int(t) + NTP_EPOCH_OFFSET
+        return struct.pack("!II", seconds & 0xFFFFFFFF, int((t % 1) * 2 ** 32))
+    @staticmethod
+    def from_ntp(data):
+        seconds, fraction = struct.unpack("!II", data)
+        return seconds - NTP_EPOCH_OFFSET + fraction / 2 ** 32
+    def query(self, sock, address):
+        """Return (offset, delay) in seconds from one request/response exchange."""
+        request = bytearray(48)
+        request[0] = 0x23  # LI 0, version 4, mode 3 (client)
+        t1 = time.time()
+        request[40:48] = self.to_ntp(t1)
+        sock.sendto(request, address)
+        while True:
+            data, _ = sock.recvfrom(512)
+            t4 = time.time()
+            # Ignore stray or late replies to an earlier sample.
+            if len(data) >= 48 and data[24:32] == request[40:48]:
+                break
+        if data[0] & 0x07 != 4 or data[1] == 0:
+            raise OSError("invalid SNTP reply (mode or stratum)")
+        t2 = self.from_ntp(data[32:40])
+        t3 = self.from_ntp(data[40:48])
+        return ((t2 - t1) + (t3 - t4)) / 2, (t4 - t1) - (t3 - t2)
+    def measure(self):
+        """Return the (offset, delay) sample with the lowest delay; raises OSError if none succeed."""
+        address = socket.getaddrinfo(self.server, self.port, 0, socket.SOCK_DGRAM)[0]
+        best = None
+        error = None
+        with socket.socket(address[0], socket.SOCK_DGRAM) as sock:
+            sock.settimeout(self.timeout)
+            for _ in range(self.samples):
+                try:
+                    sample = self.query(sock, address[4])
+                except OSError as e:
+                    error = e
+                    continue
+                if best is None or sample[1] < best[1]:
+                    best = sample
+        if best is None:
+            raise error or OSError("no SNTP samples")
+        return best
+
+
+class VirtualClock:
+    """
+    Simulated wall and monotonic clocks starting at start (epoch seconds) and running warp
+    times faster than real time. With warp 0 time only moves through advance_to(), which
+    is how soak tests step through a day.
+    """
+    def __init__(self, start, warp=1.0):
+        self.start = start
+        self.warp = warp
+        self.real_start = time.monotonic()
+        self.advanced = 0.0
+    @classmethod
+    def from_settings(cls, start, warp):
+        when = datetime.now()
+        if start:
+            try:
+                when = datetime.strptime(start, "%Y-%m-%d %H:%M")
+            except ValueError:
+                hours, minutes = map(int, start.split(":"))
+                when = when.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+        return cls(when.timestamp(), float(warp))
+    def monotonic(self):
+        return (time.monotonic() - self.real_start) * self.warp + self.advanced
+    def time(self):
+        return self.start + self.monotonic()
+    def advance_to(self, mono):
+        self.advanced += max(0.0, mono - self.monotonic())
+
+
+class TimeSource:
+    """
+    The single source of corrected wall time. Wall time is anchored to the monotonic
+    clock at sync points and served from that anchor, so an OS clock step or a manual
+    change by IT does not move the display. check() detects such discontinuities and
+    records them; the anchor only moves when reanchor() is called explicitly.
+    Offset changes are slewed in at slew_rate seconds per second so the displayed
+    time never jumps backwards; forward corrections larger than max_slew, and
+    explicit steps, apply at once. A VirtualClock can stand in for the system clocks.
+    """
+    DISCONTINUITY_THRESHOLD = 2.0
+    def __init__(self, slew_rate=0.05, max_slew=1.0, clock=None):
+        self.slew_rate = slew_rate
+        self.max_slew = max_slew
+        self.clock = clock
+        self.wall = clock.time if clock else time.time
+        self.mono = clock.monotonic if clock else monotonic
+        # Simulated seconds per real second, for timers that wait in real time.
+        self.rate = clock.warp if clock and clock.warp else 1.0
+        self.offset = 0.0
+        self.target = 0.0
+        self.synced = False
+        self.anchor_wall = self.wall()
+        self.anchor_mono = self.last = self.last_check = self.mono()
+        self.drift = 0.0
+        self.discontinuities = deque(maxlen=50)
+    def now(self):
+        mono = self.mono()
+        if self.offset != self.target:
+            allowed = (mono - self.last) * self.slew_rate
+            difference = self.target - self.offset
+            self.offset = self.target if abs(difference) <= allowed else self.offset + math.copysign(allowed, difference)
+        self.last = mono
+        return self.anchor_wall + (mono - self.anchor_mono) + self.offset
+    def set_offset(self, offset, step=False):
+        """Set the correction relative to the system clock at the current anchor."""
+        self.now()
+        self.target = offset
+        if step or offset - self.offset > self.max_slew:
+            self.offset = offset
+    def reanchor(self, offset, step=False, reason="sync"):
+        """
+        Re-anchor to the system clock now and aim for offset from it. The currently
+        displayed time carries over unchanged unless step is set.
+        """
+        shown = self.now()
+        self.anchor_wall, self.anchor_mono = self.wall(), self.mono()
+        self.last = self.anchor_mono
+        self.offset = shown - self.anchor_wall
+        self.drift = 0.0
+        self.set_offset(offset, step)
+        print(f"Time base re-anchored ({reason}), offset {offset:+.3f} s")
+    def check(self):
+        """
+        Compare the system clock and the monotonic clock against the anchor. Returns a
+        (kind, seconds) tuple if the system clock jumped or the process stalled, else None.
+        """
+        mono = self.mono()
+        gap = mono - self.last_check
+        self.last_check = mono
+        drift = (self.wall() - self.anchor_wall) - (mono - self.anchor_mono)
+        jump = drift - self.drift
+        self.drift = drift
+        event = None
+        if abs(jump) > self.DISCONTINUITY_THRESHOLD:
+            event = ("system clock jump", jump)
+        elif gap > (self.DISCONTINUITY_THRESHOLD + 1) * self.rate:
+            event = ("stall", gap)
+        if event:
+            self.discontinuities.append((self.wall(),) + event)
+        return event
+
+
+SEAT_RANGE = re.compile(r"(\d+)\s*(?:[-\u2013]\s*(\d+))?")
+
+
+@lru_cache(maxsize=4096)
+def parse_seat_rows(text):
+    """
+    Seat rows text such as "1-10, 15, 20-25" as sorted, merged (first, last) ranges.
+    Text without numbers ("No Rows Provided") gives (). Cached: each string is parsed once.
+    """
+    ranges = []
+    for first, last in SEAT_RANGE.findall(text or ""):
+        first, last = int(first), int(last or first)
+        ranges.append((min(first, last), max(first, last)))
+    ranges.sort()
+    merged = []
+    for first, last in ranges:
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return tuple(merged)
+
+
+def seat_rows_sort_key(subject):
+    """Sort subjects by their lowest seat number; rows without one sort last."""
+    ranges = parse_seat_rows(subject[2]) if isinstance(subject[2], str) else ()
+    return ranges[0][0] if ranges else float('inf')
+
+
+def parse_subject_table(text):
+    """
+    Pasted or imported subject rows (code, name, seat rows; tab-, comma-, semicolon- or
+    bar-separated) as [code, name, rows] lists. Blank lines and a header row are skipped;
+    cells past the third are seat ranges that were split on the separator.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+    sample = "\n".join(lines[:20])
+    if "\t" in sample:
+        delimiter = "\t"
+    else:
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=",;|").delimiter
+        except csv.Error:
+            delimiter = ","
+    rows = []
+    for cells in csv.reader(lines, delimiter=delimiter):
+        cells = [cell.strip() for cell in cells] + ["", ""]
+        if cells[0]:
+            rows.append([cells[0], cells[1], ", ".join(cell for cell in cells[2:] if cell)])
+    if rows and rows[0][0].lower().replace(" ", "") in ("code", "subjectcode"):
+        rows.pop(0)
+    return rows
+
+
+def build_subject_info(rows, subject_log):
+    """
+    Validate [code, name, rows] lists against the subject log in one pass. Returns
+    (subject_info, errors, warnings): names missing from a row come from the log, and a
+    code with neither is an error; repeated codes and overlapping seats are warnings.
+    """
+    subject_info, errors, warnings, seen = [], [], [], set()
+    for line, (code, name, seat_rows) in enumerate(rows, 1):
+        name = name or subject_log.get(code, "")
+        if not name:
+            errors.append(f"Line {line}: no name for unknown code {code}")
+        if code in seen:
+            warnings.append(f"Line {line}: {code} is listed more than once")
+        seen.add(code)
+        subject_info.append((code, name, seat_rows or "No Rows Provided"))
+    for first, last, subjects in SeatIndex(subject_info).overlaps():
+        warnings.append(f"Seats {SeatIndex.describe(first, last)} are shared by " + ", ".join(subject[0] for subject in subjects))
+    return subject_info, errors, warnings
+
+
+class SeatIndex:
+    """
+    Every subject's seat ranges swept into sorted, non-overlapping segments, each listing
+    the subjects seated there, so "which paper is seat 37 sitting?" is one binary search.
+    Overlaps (segments with several subjects) and gaps fall out of the same sweep.
+    """
+    def __init__(self, subject_info):
+        subjects = [tuple(subject) for subject in subject_info]
+        changes = {}
+        for position, subject in enumerate(subjects):
+            for first, last in parse_seat_rows(subject[2]):
+                changes.setdefault(first, []).append((1, position))
+                changes.setdefault(last + 1, []).append((-1, position))
+        self.segments = []
+        active = {}
+        points = sorted(changes)
+        for point, following in zip(points, points[1:] + [None]):
+            for delta, position in changes[point]:
+                active[position] = active.get(position, 0) + delta
+                if not active[position]:
+                    del active[position]
+            if active and following is not None:
+                self.segments.append((point, following - 1, tuple(subjects[position] for position in sorted(active))))
+        self.starts = [segment[0] for segment in self.segments]
+    def lookup(self, seat):
+        """The subjects seated at seat (several if ranges overlap)."""
+        position = bisect_right(self.starts, seat) - 1
+        if position >= 0 and seat <= self.segments[position][1]:
+            return self.segments[position][2]
+        return ()
+    def overlaps(self):
+        return [segment for segment in self.segments if len(segment[2]) > 1]
+    def gaps(self):
+        """(first, last) seat runs between the lowest and highest seat that no subject covers."""
+        return [(previous[1] + 1, segment[0] - 1) for previous, segment in zip(self.segments, self.segments[1:])
+                if segment[0] > previous[1] + 1]
+    @staticmethod
+    def describe(first, last):
+        return str(first) if first == last else f"{first}-{last}"
+
+
+def subject_list_version(subject_info):
+    return zlib.crc32(json.dumps([list(subject) for subject in subject_info]).encode("utf-8"))
+
+
+class LanLeader:
+    """
+    Multicasts the authoritative time and session state in one small fixed-size packet
+    per tick, so its cost does not depend on the number of followers. Followers fetch
+    the subject list by unicast request only when its version changes. Replies are
+    rate-limited per requesting address, so a spoofed request cannot turn the leader
+    into a traffic amplifier.
+    """
+    def __init__(self, group, port, interface="0.0.0.0", ttl=1, reply_interval=1.0):
+        self.address = (group, port)
+        self.reply_interval = reply_interval
+        self.replied = {}
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+        self.requests = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.requests.bind((interface, 0))
+        self.request_port = self.requests.getsockname()[1]
+        self.sequence = 0
+        self.subject_version = 0
+        self.subject_chunks = []
+        threading.Thread(target=self.serve, name="lan-leader", daemon=True).start()
+    def set_subjects(self, subject_info):
+        version = subject_list_version(subject_info)
+        payload = zlib.compress(json.dumps({"version": version, "subject_info": [list(s) for s in subject_info]},
+                                           separators=(",", ":")).encode("utf-8"))
+        pieces = [payload[i:i + LAN_CHUNK_SIZE] for i in range(0, len(payload), LAN_CHUNK_SIZE)] or [b""]
+        self.subject_chunks = [LAN_CHUNK.pack(LAN_MAGIC, b"S", version, index, len(pieces)) + piece
+                               for index, piece in enumerate(pieces)]
+        self.subject_version = version
+    def publish(self, now, session, demo):
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        flags = (1 if demo else 0) | (2 if session else 0)
+        start, end = (session.start, session.end) if session else (0.0, 0.0)
+        packet = LAN_PACKET.pack(LAN_MAGIC, LAN_VERSION, flags, self.request_port, self.sequence,
+                                 now, start, end, self.subject_version)
+        try:
+            self.sock.sendto(packet, self.address)
+        except OSError as e:
+            print("LAN broadcast failed:", e)
+    def serve(self):
+        while True:
+            try:
+                data, address = self.requests.recvfrom(64)
+                if data.startswith(LAN_MAGIC + b"?") and self.may_reply(address[0], time.monotonic()):
+                    for chunk in self.subject_chunks:
+                        self.requests.sendto(chunk, address)
+            except OSError as e:
+                if self.requests.fileno() == -1:
+                    return
+                print("LAN subject list reply failed:", e)
+    def may_reply(self, host, now):
+        """True at most once per reply_interval for each host; forgets quiet hosts so the table stays small."""
+        if now - self.replied.get(host, -math.inf) < self.reply_interval:
+            return False
+        if len(self.replied) >= 1024:
+            self.replied = {known: at for known, at in self.replied.items() if now - at < self.reply_interval}
+        self.replied[host] = now
+        return True
+    def close(self):
+        self.sock.close()
+        self.requests.close()
+
+
+class LanFollower:
+    """
+    Receives the leader's packets and posts ("lan", state) events. The clock offset is
+    (leader time + one-way latency - local receive time); the largest of the recent
+    samples is used since queueing delay only ever makes a sample smaller.
+    """
+    def __init__(self, group, port, events, interface="0.0.0.0", latency=0.0005, request_spread=1.0):
+        self.events = events
+        self.latency = latency
+        self.request_spread = request_spread
+        self.samples = deque(maxlen=8)
+        self.subject_version = None
+        self.chunks = {}
+        self.request_at = None
+        self.leader = None
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("", port))
+        membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton(interface))
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.requests = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.requests.bind((interface, 0))
+        threading.Thread(target=self.run, name="lan-follower", daemon=True).start()
+    def run(self):
+        while True:
+            timeout = None if self.request_at is None else max(0.0, self.request_at - time.monotonic())
+            try:
+                readable, _, _ = select.select([self.sock, self.requests], [], [], timeout)
+                if self.sock in readable:
+                    data, address = self.sock.recvfrom(512)
+                    self.receive(data, address, time.time())
+                if self.requests in readable:
+                    self.receive_subjects(self.requests.recv(65535))
+                if self.request_at is not None and time.monotonic() >= self.request_at and self.leader:
+                    self.request_at = None
+                    self.requests.sendto(LAN_MAGIC + b"?", self.leader)
+            except OSError:
+                if self.sock.fileno() == -1:
+                    return
+    def receive(self, data, address, received):
+        if len(data) != LAN_PACKET.size:
+            return
+        magic, version, flags, request_port, sequence, sent, start, end, subject_version = LAN_PACKET.unpack(data)
+        if magic != LAN_MAGIC or version != LAN_VERSION:
+            return
+        self.samples.append(sent + self.latency - received)
+        self.leader = (address[0], request_port)
+        if subject_version != self.subject_version and self.request_at is None:
+            # Spread the requests of many followers over request_spread seconds.
+            self.request_at = time.monotonic() + random.uniform(0, self.request_spread)
+        self.events.put(("lan", {"offset": max(self.samples), "start": start, "end": end,
+                                 "has_session": bool(flags & 2), "demo": bool(flags & 1)}))
+    def receive_subjects(self, data):
+        """Collect one chunk of the subject list; post the list once every chunk of a version has arrived."""
+        if len(data) < LAN_CHUNK.size:
+            return
+        magic, kind, version, index, count = LAN_CHUNK.unpack_from(data)
+        if magic != LAN_MAGIC or kind != b"S" or index >= count:
+            return
+        if any(key[0] != version or key[2] != count for key in self.chunks):
+            self.chunks.clear()
+        self.chunks[(version, index, count)] = data[LAN_CHUNK.size:]
+        if len(self.chunks) < count:
+            return
+        compressed = b"".join(self.chunks[(version, i, count)] for i in range(count))
+        self.chunks.clear()
+        try:
+            payload = json.loads(zlib.decompress(compressed).decode("utf-8"))
+            subject_info = [tuple(subject) for subject in payload["subject_info"]]
+            if payload["version"] != version:
+                raise ValueError("version mismatch")
+        except (ValueError, KeyError, TypeError, zlib.error) as e:
+            print("Ignoring malformed LAN subject list:", e)
+            return
+        self.subject_version = version
+        self.events.put(("lan_subjects", subject_info))
+    def close(self):
+        self.sock.close()
+        self.requests.close()
+
+
+class StatusServer:
+    """
+    Read-only HTTP server running its own asyncio loop on a daemon thread.
+    GET /status returns the latest snapshot as JSON, GET /events streams it as
+    Server-Sent Events and GET / serves a small page that follows the stream.
+    Each published snapshot is serialized once and the same bytes go to every client.
+    """
+    MAX_BUFFERED = 64 * 1024
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.clients = set()
+        self.status_body = b"{}"
+        self.loop = asyncio.new_event_loop()
+        self.server = None
+        self.error = None
+        started = threading.Event()
+        threading.Thread(target=self.run, args=(started,), name="status-server", daemon=True).start()
+        started.wait(5)
+        if self.error:
+            raise self.error
+    def run(self, started):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handle, self.host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self.error = e
+            started.set()
+            return
+        started.set()
+        self.loop.run_forever()
+    def publish(self, snapshot):
+        """Called from the Tk thread; the snapshot must not be mutated afterwards."""
+        self.loop.call_soon_threadsafe(self.broadcast, snapshot)
+    def broadcast(self, snapshot):
+        self.status_body = json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+        chunk = b"data: " + self.status_body + b"\n\n"
+        for writer in list(self.clients):
+            # A viewer that stopped reading is dropped rather than buffered without bound.
+            if writer.transport.get_write_buffer_size() > self.MAX_BUFFERED:
+                self.clients.discard(writer)
+                writer.close()
+            else:
+                writer.write(chunk)
+    async def handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+        parts = request.split(b"\r\n", 1)[0].split()
+        path = parts[1].split(b"?")[0] if len(parts) >= 2 and parts[0] == b"GET" else None
+        if path == b"/events":
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                         b"Access-Control-Allow-Origin: *\r\nConnection: keep-alive\r\n\r\n"
+                         b"data: " + self.status_body + b"\n\n")
+            self.clients.add(writer)
+            try:
+                # Nothing more is expected from the client; EOF means it went away.
+                while await reader.read(1024):
+                    pass
+            except ConnectionError:
+                pass
+            finally:
+                self.clients.discard(writer)
+                writer.close()
+            return
+        if path == b"/status":
+            status, content_type, body = b"200 OK", b"application/json", self.status_body
+        elif path == b"/":
+            status, content_type, body = b"200 OK", b"text/html; charset=utf-8", STATUS_PAGE
+        else:
+            status, content_type, body = b"404 Not Found", b"text/plain", b"Not found"
+        writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Type: " + content_type +
+                     b"\r\nAccess-Control-Allow-Origin: *\r\nContent-Length: " + str(len(body)).encode() +
+                     b"\r\nConnection: close\r\n\r\n" + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+    def close(self):
+        def stop():
+            if self.server:
+                self.server.close()
+            for writer in self.clients:
+                writer.close()
+            self.loop.stop()
+        self.loop.call_soon_threadsafe(stop)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram plus a ring of the most recent (wall time, ms) samples."""
+    def __init__(self, samples):
+        self.counts = [0] * (len(METRIC_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=samples)
+    def add(self, ms, when):
+        self.counts[bisect_left(METRIC_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        self.recent.append((when, ms))
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (the max for the overflow bucket)."""
+        seen, rank = 0, p * self.count
+        for bound, count in zip(METRIC_BUCKETS_MS, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+    def summary(self):
+        return {"count": self.count, "mean_ms": self.total / self.count if self.count else 0.0,
+                "p50_ms": self.percentile(0.5), "p95_ms": self.percentile(0.95), "p99_ms": self.percentile(0.99),
+                "max_ms": self.max, "last_ms": self.recent[-1][1] if self.recent else None}
+
+
+class Metrics:
+    """
+    Named histograms for hot-path timings, cheap enough to leave on all session:
+    recording is two perf_counter() calls, a bisect and a deque append.
+    """
+    def __init__(self, samples=600, enabled=True, clock=time.time):
+        self.samples = samples
+        self.enabled = enabled
+        self.clock = clock
+        self.histograms = {}
+        self.started = clock()
+        # Power mode -> [process CPU seconds, wall seconds] spent in it.
+        self.cpu = {}
+        self.mode = None
+    def set_mode(self, mode):
+        cpu, wall = time.process_time(), time.monotonic()
+        if self.mode is not None:
+            spent = self.cpu.setdefault(self.mode, [0.0, 0.0])
+            spent[0] += cpu - self.mode_cpu
+            spent[1] += wall - self.mode_wall
+        self.mode, self.mode_cpu, self.mode_wall = mode, cpu, wall
+    def cpu_usage(self):
+        """Mode -> (CPU percent, hours spent in the mode), including the current span."""
+        self.set_mode(self.mode)
+        return {mode: (100 * cpu / wall if wall else 0.0, wall / 3600) for mode, (cpu, wall) in self.cpu.items()}
+    def record(self, name, seconds, when=None):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(self.samples)
+        histogram.add(seconds * 1000, self.clock() if when is None else when)
+    def timed(self, name, func):
+        """Wrap func so every call is recorded under name."""
+        if not self.enabled:
+            return func
+        perf_counter = time.perf_counter
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, perf_counter() - start)
+        wrapper.__name__ = getattr(func, "__name__", name)
+        return wrapper
+    def report(self):
+        lines = [f"{'metric':<24}{'count':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)"]
+        for name in sorted(self.histograms):
+            s = self.histograms[name].summary()
+            lines.append(f"{name:<24}{s['count']:>8}{s['mean_ms']:>9.2f}{s['p50_ms']:>9.2f}"
+                         f"{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}")
+        lines.append("")
+        for mode, (percent, hours) in sorted(self.cpu_usage().items()):
+            lines.append(f"CPU while {mode}: {percent:.2f}% over {hours:.2f} h")
+        return "\n".join(lines)
+    def dump(self, path):
+        """Write summaries, bucket counts and recent samples as JSON, for lining stutters up with operations."""
+        data = {"started": self.started, "dumped": self.clock(), "buckets_ms": list(METRIC_BUCKETS_MS),
+                "cpu_percent": {mode: percent for mode, (percent, hours) in self.cpu_usage().items()}, "metrics": {
+            name: dict(h.summary(), buckets=h.counts, recent=list(h.recent)) for name, h in self.histograms.items()}}
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(data, file, indent=1)
+        except OSError as e:
+            print("Error writing metrics:", e)
+
+
+class RuntimeProfiler:
+    """
+    Profiles Tk-thread callbacks with cProfile and tracks allocations with tracemalloc
+    for a bounded window, then writes a text report. The clock keeps running throughout.
+    """
+    def __init__(self, root, directory, duration=300, top=25, frames=5):
+        self.root = root
+        self.directory = directory
+        self.duration = duration
+        self.top = top
+        self.frames = frames
+        self.profile = None
+        self.after_id = None
+    @property
+    def running(self):
+        return self.profile is not None
+    def census(self):
+        """Pending Tk after callbacks and open Toplevels."""
+        try:
+            pending = len(self.root.tk.splitlist(self.root.tk.call("after", "info")))
+        except (AttributeError, tk.TclError):
+            pending = None
+        toplevels, stack = 0, [self.root]
+        while stack:
+            children = stack.pop().winfo_children()
+            toplevels += sum(1 for child in children if isinstance(child, tk.Toplevel))
+            stack.extend(children)
+        return {"after callbacks": pending, "toplevels": toplevels}
+    def start(self):
+        if self.running:
+            return
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start(self.frames)
+        self.snapshot = tracemalloc.take_snapshot()
+        self.census_before = self.census()
+        self.start_time = time.time()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        self.after_id = self.root.after(int(self.duration * 1000), self.stop)
+        print(f"Profiling for up to {self.duration} s")
+    def stop(self):
+        """End the window and write the report; returns its path (None if not running or unwritable)."""
+        if not self.running:
+            return None
+        self.profile.disable()
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        snapshot = tracemalloc.take_snapshot()
+        if self.started_tracing:
+            tracemalloc.stop()
+        report = self.report(self.profile, snapshot)
+        self.profile = self.snapshot = None
+        path = os.path.join(self.directory, time.strftime("profile-%Y%m%d-%H%M%S.txt", time.localtime(self.start_time)))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(report)
+        except OSError as e:
+            print("Error writing profile report:", e)
+            return None
+        print("Profile report written to", path)
+        return path
+    def report(self, profile, snapshot):
+        out = io.StringIO()
+        elapsed = time.time() - self.start_time
+        out.write(f"Profile from {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.start_time))}, {elapsed:.1f} s\n\n")
+        census = self.census()
+        out.write("Live objects (start -> end):\n")
+        for name, before in self.census_before.items():
+            out.write(f"  {name}: {before} -> {census[name]}\n")
+        out.write(f"\nTop {self.top} callbacks by cumulative time:\n")
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(self.top)
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, pstats.__file__)]
+        growth = snapshot.filter_traces(ignore).compare_to(self.snapshot.filter_traces(ignore), "lineno")
+        out.write(f"Top {self.top} allocation sites by growth:\n")
+        for stat in growth[:self.top]:
+            out.write(f"  {stat}\n")
+        return out.getvalue()
+
+
+class TickScheduler:
+    """
+    Drives periodic jobs from a single Tk timer aligned to wall-clock second boundaries.
+    The delay is recomputed from the clock on every tick, so time spent in jobs and
+    late timer callbacks never accumulates as drift.
+    """
+    def __init__(self, root, clock=time.time, on_skip=None, metrics=None, rate=1.0):
+        self.root = root
+        self.clock = clock
+        self.rate = rate
+        self.on_skip = on_skip
+        self.metrics = metrics
+        self.jobs = []
+        self.after_id = None
+        self.target = None
+        self.last_second = None
+        self.lateness = 0.0
+        self.skipped_seconds = 0
+    def register(self, callback, period=1):
+        """
+        Call callback(now) on every tick whose second is a multiple of period. If it returns
+        a time, it is not called again before then (math.inf: not until woken).
+        """
+        self.jobs.append([callback, period, None])
+    def unregister(self, callback):
+        self.jobs = [job for job in self.jobs if job[0] != callback]
+    def wake(self, *callbacks):
+        """Run sleeping jobs again from the next tick, e.g. when what they were waiting for changed."""
+        for job in self.jobs:
+            if job[0] in callbacks:
+                job[2] = None
+    def start(self):
+        if self.after_id is None:
+            self.tick()
+    def stop(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.resync()
+    def resync(self):
+        """
+        Forget the last tick, e.g. after a deliberate clock correction, so the jump is not
+        reported as skipped, and wake sleeping jobs: their due times are on the old clock.
+        """
+        self.target = None
+        self.last_second = None
+        for job in self.jobs:
+            job[2] = None
+    def tick(self):
+        self.after_id = None
+        now = self.clock()
+        if self.target is not None:
+            if self.target - 1 <= now < self.target:
+                # Tk fired before the boundary; wait out the remainder so no second repeats.
+                self.schedule(now)
+                return
+            if now < self.target:
+                # The clock was set backwards; start counting again from here, and wake sleeping jobs.
+                self.last_second = None
+                for job in self.jobs:
+                    job[2] = None
+            self.lateness = max(0.0, now - self.target)
+            if self.metrics:
+                self.metrics.record("tick.lateness", self.lateness, now)
+        second = int(now)
+        if self.last_second is not None and second - self.last_second > 1:
+            missed = second - self.last_second - 1
+            self.skipped_seconds += missed
+            if self.on_skip:
+                self.on_skip(missed, self.lateness)
+        self.last_second = second
+        # Job cost is measured in real time; self.clock may be simulated.
+        started = time.perf_counter()
+        for job in list(self.jobs):
+            callback, period, due = job
+            if due is not None and second < due:
+                continue
+            job[2] = (second // period + 1) * period
+            try:
+                wake = callback(now)
+            except Exception as e:
+                wake = None
+                print(f"Error in scheduled job {getattr(callback, '__name__', callback)}:", e)
+            if wake is not None:
+                job[2] = max(job[2], wake)
+        self.target = second + 1
+        if self.metrics:
+            self.metrics.record("tick.jobs", time.perf_counter() - started, now)
+        self.schedule(self.clock())
+    def schedule(self, now):
+        delay = max(1, math.ceil((self.target - now) * 1000 / self.rate))
+        self.after_id = self.root.after(delay, self.tick)
+
+
+class ExamSession:
+    """
+    An exam window resolved once to epoch seconds, with the colour band thresholds
+    precomputed, so the per-tick progress update is only a few float comparisons.
+    """
+    WARNING_SECONDS = 30 * 60
+    CRITICAL_SECONDS = 10 * 60
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.duration = end - start
+        self.warning_at = end - self.WARNING_SECONDS
+        self.critical_at = end - self.CRITICAL_SECONDS
+        # Before the start the band reflects the full duration, as the time left.
+        if self.duration <= self.CRITICAL_SECONDS:
+            self.pending_band = "critical"
+        elif self.duration <= self.WARNING_SECONDS:
+            self.pending_band = "warning"
+        else:
+            self.pending_band = "normal"
+    @classmethod
+    def from_strings(cls, exam_date, start_time, end_time):
+        """Build a session from "DD-Mon-YYYY" and "HH:MM" strings; an end at or before the start is taken to be after midnight."""
+        try:
+            day = datetime.strptime(exam_date, "%d-%b-%Y").date()
+        except (TypeError, ValueError):
+            day = datetime.now().date()
+        start = datetime.combine(day, datetime.strptime(start_time, "%H:%M").time())
+        end = datetime.combine(day, datetime.strptime(end_time, "%H:%M").time())
+        if end <= start:
+            end += timedelta(days=1)
+        return cls(start.timestamp(), end.timestamp())
+    def state(self, now):
+        """Return (progress percent, band name) at epoch time now."""
+        if now < self.start:
+            return 0.0, self.pending_band
+        if now >= self.end:
+            return 100.0, "critical"
+        progress = (now - self.start) / self.duration * 100
+        if now >= self.critical_at:
+            return progress, "critical"
+        if now >= self.warning_at:
+            return progress, "warning"
+        return progress, "normal"
+
+
+class CanvasClock:
+    """
+    The clock face drawn as one canvas text item per character in fixed-width cells, so a
+    tick reconfigures only the glyphs that changed (usually just the last seconds digit)
+    and Tk never re-measures the whole string. Flashing recolours the existing items.
+    """
+    # (family, size, weight) -> (digit cell width, separator cell width, line height), measured once per size.
+    glyph_metrics = {}
+    def __init__(self, master, font, fg, bg, pad=10):
+        self.canvas = tk.Canvas(master, bg=bg, bd=0, highlightthickness=0)
+        self.font = font
+        self.fg = fg
+        self.pad = pad
+        self.items = []
+        self.text = ""
+    def pack(self, **options):
+        self.canvas.pack(**options)
+    def measure(self):
+        font = self.font
+        key = (font.cget("family"), font.cget("size"), font.cget("weight"))
+        if key not in self.glyph_metrics:
+            self.glyph_metrics[key] = (max(font.measure(digit) for digit in "0123456789"),
+                                       font.measure(":"), font.metrics("linespace"))
+        return self.glyph_metrics[key]
+    def layout(self, text):
+        """Recreate the items for text; only needed when its length or separator positions change."""
+        digit_width, separator_width, height = self.measure()
+        self.canvas.delete("glyph")
+        self.items = []
+        x = self.pad
+        for char in text:
+            width = digit_width if char.isdigit() else separator_width
+            self.items.append(self.canvas.create_text(x + width / 2, self.pad + height / 2, text=char,
+                                                      font=self.font, fill=self.fg, tags="glyph"))
+            x += width
+        self.canvas.configure(width=x + self.pad, height=height + 2 * self.pad)
+        self.text = text
+    def show(self, text):
+        if len(text) != len(self.text):
+            self.layout(text)
+            return
+        for position, (old, new) in enumerate(zip(self.text, text)):
+            if old != new:
+                if old.isdigit() != new.isdigit():
+                    self.layout(text)
+                    return
+                self.canvas.itemconfigure(self.items[position], text=new)
+        self.text = text
+    def set_color(self, fg):
+        self.canvas.itemconfigure("glyph", fill=fg)
+    def configure(self, font, fg, bg):
+        self.font = font
+        self.fg = fg
+        self.canvas.configure(bg=bg)
+        self.layout(self.text)
+
+
+class SubjectRow:
+    """A pooled subject table row; only the label options whose values changed are reconfigured."""
+    def __init__(self, master, on_double_click):
+        self.key = None
+        self.frame = tk.Frame(master, bd=1, relief="ridge")
+        self.frame_bg = None
+        self.labels = []
+        self.options = [{}, {}, {}]
+        for column, sticky in enumerate(("w", "ew", "e")):
+            label = tk.Label(self.frame)
+            label.grid(row=0, column=column, sticky=sticky, padx=10, pady=5)
+            self.frame.columnconfigure(column, weight=2 if column == 1 else 1)
+            self.labels.append(label)
+        # Bound once; the handler looks up whichever subject the row currently shows.
+        for widget in [self.frame] + self.labels:
+            widget.bind("<Double-Button-1>", lambda e: on_double_click(self.key))
+    def update(self, texts, font, fg, bg):
+        if bg != self.frame_bg:
+            self.frame.configure(bg=bg)
+            self.frame_bg = bg
+        for label, current, text in zip(self.labels, self.options, texts):
+            wanted = {"text": text, "font": font, "fg": fg, "bg": bg}
+            changed = {k: v for k, v in wanted.items() if current.get(k) != v}
+            if changed:
+                label.configure(**changed)
+                current.update(changed)
+
+
+class SubjectTable:
+    """
+    Renders subject_info into a frame from a pool of SubjectRow widgets keyed by subject
+    code. Rows are reused and reordered in place rather than rebuilt, and at most
+    page_size rows exist at once; longer lists are shown a page at a time.
+    """
+    def __init__(self, master, on_edit, page_size=12):
+        self.master = master
+        self.on_edit = on_edit
+        self.page_size = page_size
+        self.page = 0
+        self.rows = {}
+        self.spare = []
+        self.order = []
+        self.index_of = {}
+        self.subject_info = []
+        self.style = None
+        self.header = tk.Frame(master)
+        self.header.pack(fill="x", pady=(0, 5))
+        self.header_labels = []
+        for column, (text, sticky) in enumerate((("Code", "w"), ("Subject", "ew"), ("Rows", "e"))):
+            label = tk.Label(self.header, text=text, fg="white")
+            label.grid(row=0, column=column, sticky=sticky, padx=10)
+            self.header.columnconfigure(column, weight=2 if column == 1 else 1)
+            self.header_labels.append(label)
+        self.page_label = tk.Label(self.header, text="", fg="#aaaaaa")
+        self.page_label.grid(row=0, column=3, sticky="e", padx=10)
+    def page_count(self):
+        return max(1, math.ceil(len(self.subject_info) / self.page_size))
+    def render(self, subject_info, font, bg, row_bg="#333333", fg="white"):
+        self.subject_info = subject_info
+        if self.style != (font, bg):
+            self.style = (font, bg)
+            self.header.configure(bg=bg)
+            for label in self.header_labels:
+                label.configure(font=font, bg=bg)
+            self.page_label.configure(font=font, bg=bg)
+        # Key rows by subject code; repeated codes get an occurrence suffix.
+        self.index_of = {}
+        keys = []
+        for index, (subject_code, _, _) in enumerate(subject_info):
+            key = subject_code
+            occurrence = 1
+            while key in self.index_of:
+                occurrence += 1
+                key = f"{subject_code}#{occurrence}"
+            self.index_of[key] = index
+            keys.append(key)
+        pages = self.page_count()
+        self.page = min(self.page, pages - 1)
+        first = self.page * self.page_size
+        visible = keys[first:first + self.page_size]
+        self.page_label.configure(text=f"Page {self.page + 1}/{pages}" if pages > 1 else "")
+        wanted = set(visible)
+        for key in [key for key in self.rows if key not in wanted]:
+            row = self.rows.pop(key)
+            row.frame.pack_forget()
+            row.key = None
+            self.spare.append(row)
+        for key in visible:
+            row = self.rows.get(key)
+            if row is None:
+                row = self.spare.pop() if self.spare else SubjectRow(self.master, self.edit_row)
+                row.key = key
+                self.rows[key] = row
+            row.update(subject_info[self.index_of[key]], font, fg, row_bg)
+        if visible != self.order:
+            previous = self.header
+            for key in visible:
+                self.rows[key].frame.pack(fill="x", padx=10, pady=2, after=previous)
+                previous = self.rows[key].frame
+            self.order = visible
+    def next_page(self, now=None):
+        """Advance to the next page; registered as a periodic scheduler job."""
+        if self.page_count() > 1 and self.style:
+            self.page = (self.page + 1) % self.page_count()
+            self.render(self.subject_info, *self.style)
+    def edit_row(self, key):
+        if key in self.index_of:
+            self.on_edit(self.index_of[key])
+
+
+class SubjectLookup:
+    """
+    Several subject indexes searched in order, e.g. the subject log before the on-disk
+    catalogue: a code found in an earlier index shadows it in later ones, and later
+    indexes are only queried while the earlier ones leave the limit unfilled.
+    """
+    def __init__(self, *indexes):
+        self.indexes = indexes
+    def __contains__(self, code):
+        return any(code in index for index in self.indexes)
+    def get(self, code, default=None):
+        for index in self.indexes:
+            name = index.get(code)
+            if name is not None:
+                return name
+        return default
+    def reset(self):
+        for index in self.indexes:
+            index.reset()
+    def search(self, prefix, limit=50):
+        results, codes = [], set()
+        for index in self.indexes:
+            if len(results) >= limit:
+                break
+            for value in index.search(prefix, limit):
+                code = value.split(" - ", 1)[0]
+                if code not in codes:
+                    codes.add(code)
+                    results.append(value)
+        return results[:limit]
+
+
+class SubjectIndex:
+    """
+    Case-folded sorted prefix index over a {code: name} subject log. Codes and every
+    word-suffix of each name are indexed, so "econ" finds "GFE6213 - BASIC ECONOMETRICS".
+    A search that extends the previous prefix only bisects within the previous range.
+    """
+    def __init__(self, subject_log):
+        self.names = {}
+        self.code_keys, self.code_values = [], []
+        self.name_keys, self.name_values = [], []
+        code_entries, name_entries = [], []
+        for code, name in subject_log.items():
+            if isinstance(name, str):
+                self.names[code] = name
+                code_entries.extend(self.code_entries(code, name))
+                name_entries.extend(self.name_entries(code, name))
+        code_entries.sort()
+        name_entries.sort()
+        self.code_keys = [key for key, _ in code_entries]
+        self.code_values = [value for _, value in code_entries]
+        self.name_keys = [key for key, _ in name_entries]
+        self.name_values = [value for _, value in name_entries]
+        self.reset()
+    @staticmethod
+    def code_entries(code, name):
+        return [(code.casefold(), f"{code} - {name}")]
+    @staticmethod
+    def name_entries(code, name):
+        words = name.casefold().split()
+        return [(" ".join(words[i:]), f"{code} - {name}") for i in range(len(words))]
+    def reset(self):
+        self.last_prefix = None
+        self.code_range = (0, len(self.code_keys))
+        self.name_range = (0, len(self.name_keys))
+    def __len__(self):
+        return len(self.names)
+    def __contains__(self, code):
+        return code in self.names
+    def get(self, code, default=None):
+        return self.names.get(code, default)
+    def add(self, code, name):
+        if code in self.names or not isinstance(name, str):
+            return
+        self.names[code] = name
+        for keys, values, entries in ((self.code_keys, self.code_values, self.code_entries(code, name)),
+                                      (self.name_keys, self.name_values, self.name_entries(code, name))):
+            for key, value in entries:
+                position = bisect_left(keys, key)
+                keys.insert(position, key)
+                values.insert(position, value)
+        self.reset()
+    def search(self, prefix, limit=50):
+        """Return up to limit "CODE - Name" suggestions, code matches first."""
+        folded = prefix.casefold()
+        if self.last_prefix is None or not folded.startswith(self.last_prefix):
+            self.reset()
+        self.last_prefix = folded
+        self.code_range = self.narrow(self.code_keys, folded, *self.code_range)
+        self.name_range = self.narrow(self.name_keys, folded, *self.name_range)
+        results = []
+        seen = set()
+        for values, (lo, hi) in ((self.code_values, self.code_range), (self.name_values, self.name_range)):
+            # Index rather than slice, so the cost is bounded by limit, not by the size of the match.
+            for position in range(lo, hi):
+                value = values[position]
+                if value not in seen:
+                    seen.add(value)
+                    results.append(value)
+                    if len(results) >= limit:
+                        return results
+        return results
+    @staticmethod
+    def narrow(keys, prefix, lo, hi):
+        lo = bisect_left(keys, prefix, lo, hi)
+        return lo, bisect_left(keys, prefix + "\U0010ffff", lo, hi)
+
+
+class AlertTimeline:
+    """
+    A session's alert rules compiled into a heap of (time, kind, label) events, so
+    the per-tick check is a comparison against the earliest event. Half-hour marks
+    are generated one at a time as each is consumed.
+    """
+    def __init__(self, session, now, minutes_before_end=(), exam_end=True, half_hour_marks=True, catch_up=60):
+        self.catch_up = catch_up
+        self.heap = []
+        if session is not None:
+            for minutes in minutes_before_end:
+                when = session.end - minutes * 60
+                if when > session.start:
+                    self.heap.append((when, "warning", f"{minutes} minutes remaining"))
+            if exam_end:
+                self.heap.append((session.end, "end", "Exam ended"))
+        self.heap = [event for event in self.heap if event[0] > now - catch_up]
+        if half_hour_marks:
+            self.heap.append((self.next_half_hour(now), "half_hour", "Half-hour mark"))
+        heapq.heapify(self.heap)
+    @staticmethod
+    def next_half_hour(after):
+        """The first local :00 or :30 strictly after epoch time after."""
+        local = time.localtime(after)
+        return int(after) - (local.tm_min % 30) * 60 - local.tm_sec + 1800
+    def due(self, now):
+        """Pop and return the events due at now, dropping any more than catch_up seconds stale."""
+        fired = []
+        while self.heap and self.heap[0][0] <= now:
+            event = heapq.heappop(self.heap)
+            if event[1] == "half_hour":
+                heapq.heappush(self.heap, (self.next_half_hour(event[0]), "half_hour", event[2]))
+            if now - event[0] <= self.catch_up:
+                fired.append(event)
+        return fired
+
+
+class FlashAnimation:
+    """
+    Alternates between a flash and normal state from a single after() chain.
+    Starting a new flash while one runs restarts it instead of queueing more steps.
+    """
+    def __init__(self, widget, on_step):
+        self.widget = widget
+        self.on_step = on_step
+        self.after_id = None
+        self.remaining = 0
+        self.delay = 0
+        self.flashing = False
+    def start(self, count, delay):
+        self.stop()
+        self.remaining = count
+        self.delay = delay
+        self.flashing = False
+        self.step()
+    def step(self):
+        self.after_id = None
+        if self.remaining <= 0:
+            self.on_step(False)
+            return
+        self.remaining -= 1
+        self.flashing = not self.flashing
+        self.on_step(self.flashing)
+        self.after_id = self.widget.after(self.delay, self.step)
+    def stop(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+            self.on_step(False)
+        self.remaining = 0
+
+
 class AutocompleteEntry(tk.Entry):
     """
     An Entry widget with autocompletion functionality.
     Suggestions are in the format "CODE - Subject Name". Only the code is inserted.
-    Autocompletion starts from the first letter.
+    Suggestions come from a SubjectIndex (matching codes and name words), are capped at
+    max_results, and the Listbox is refreshed once typing pauses for debounce_ms. The
+    Listbox is placed in the entry's toplevel, at least listbox_width characters wide,
+    so it is not clipped when the entry sits in a small frame.
     """
-    def __init__(self, master, autocomplete_list, *args, **kwargs):
+    def __init__(self, master, index, *args, max_results=50, debounce_ms=80, listbox_width=50, **kwargs):
         super().__init__(master, *args, **kwargs)
-        self.autocomplete_list = autocomplete_list
+        self.index = index
+        self.max_results = max_results
+        self.listbox_width = listbox_width
+        self.debounce_ms = debounce_ms
+        self.pending = None
+        self.shown = []
         self.var = self["textvariable"]
         if not self.var:
             self.var = self["textvariable"] = tk.StringVar()
@@ -97,36 +1658,50 @@ class AutocompleteEntry(tk.Entry):
         self.bind("<Down>", self.move_down)
         self.listbox_up = False
     def changed(self, name, index, mode):
-        if self.var.get() == '':
-            if self.listbox_up:
-                self.listbox.destroy()
-                self.listbox_up = False
-        else:
-            words = self.comparison()
-            if words:
-                if not self.listbox_up:
-                    self.listbox = tk.Listbox(self.master, width=self["width"], font=self["font"])
-                    self.listbox.bind("<Button-1>", self.selection)
-                    self.listbox.bind("<Right>", self.selection)
-                    self.listbox.place(x=self.winfo_x(), y=self.winfo_y() + self.winfo_height())
-                    self.listbox_up = True
+        if self.pending:
+            self.after_cancel(self.pending)
+        self.pending = self.after(self.debounce_ms, self.refresh)
+    def refresh(self):
+        self.pending = None
+        words = self.comparison() if self.var.get() else []
+        if words:
+            if not self.listbox_up:
+                popup = self.winfo_toplevel()
+                self.listbox = tk.Listbox(popup, width=max(int(self["width"]), self.listbox_width), font=self["font"])
+                self.listbox.bind("<Button-1>", self.selection)
+                self.listbox.bind("<Right>", self.selection)
+                self.listbox.place(x=self.winfo_rootx() - popup.winfo_rootx(),
+                                   y=self.winfo_rooty() - popup.winfo_rooty() + self.winfo_height())
+                self.listbox.lift()
+                self.listbox_up = True
+                self.shown = []
+            if words != self.shown:
                 self.listbox.delete(0, tk.END)
-                for w in words:
-                    self.listbox.insert(tk.END, w)
-            else:
-                if self.listbox_up:
-                    self.listbox.destroy()
-                    self.listbox_up = False
+                self.listbox.insert(tk.END, *words)
+                self.shown = words
+        else:
+            self.hide_listbox()
+    def hide_listbox(self):
+        if self.listbox_up:
+            self.listbox.destroy()
+            self.listbox_up = False
     def selection(self, event):
         if self.listbox_up:
             index = self.listbox.nearest(event.y)
             value = self.listbox.get(index)
             if " - " in value:
                 value = value.split(" - ")[0]
+            if self.pending:
+                self.after_cancel(self.pending)
+                self.pending = None
             self.var.set(value)
-            self.listbox.destroy()
-            self.listbox_up = False
+            self.hide_listbox()
             self.icursor(tk.END)
+    def destroy(self):
+        if self.pending:
+            self.after_cancel(self.pending)
+            self.pending = None
+        super().destroy()
     def move_up(self, event):
         if self.listbox_up:
             if self.listbox.curselection() == ():
@@ -150,44 +1725,35 @@ class AutocompleteEntry(tk.Entry):
                 self.listbox.selection_set(first=index)
                 self.listbox.activate(index)
     def comparison(self):
-        pattern = self.var.get().lower()
-        return [w for w in self.autocomplete_list if w.lower().startswith(pattern)]
+        return self.index.search(self.var.get(), self.max_results)
 
 
 class FullScreenClockApp:
-    def __init__(self, root, config_choice):
+    scheduler = None
+    power_mode = "active"
+    seat_index_version = None
+    catalogue = None
+    
+    def __init__(self, root, config_choice, clock=None):
         self.root = root
         self.root.title("Exam Clock & Information")
         self.root.attributes('-fullscreen', True)
         self.root.configure(bg="#1a1a1a")
-        # Adaptive fonts and icon sizes.
-        screen_width = self.root.winfo_screenwidth()
-        if screen_width < 1280:
-            self.clock_font = ("Helvetica", 80, "bold")
-            self.info_font = ("Helvetica", 18, "bold")
-            self.sub_header_font = ("Helvetica", 24)
-            self.custom_font = ("Helvetica", 18)
-            self.icon_font = ("Helvetica", 12)
-        else:
-            self.clock_font = ("Helvetica", 140, "bold")
-            self.info_font = ("Helvetica", 28, "bold")
-            self.sub_header_font = ("Helvetica", 32)
-            self.custom_font = ("Helvetica", 20)
-            self.icon_font = ("Helvetica", 16)
-        self.flash_count = 6
-        self.flash_delay = 500
-        self.main_bg_color = "#1a1a1a"
-        self.header_bg_color = "#2c2c2c"
-        self.clock_fg_color = "#FFFF00"
-        self.clock_bg_color = "#000000"
-        self.time_offset = 0
-        self.exam_date = time.strftime("%d-%b-%Y", time.localtime())
+        self.store = ConfigStore(LOG_FILE)
+        self.init_appearance()
+        self.init_time_source(clock)
+        self.exam_date = time.strftime("%d-%b-%Y", time.localtime(self.current_time()))
         self.exam_start_time = None
         self.exam_end_time = None
         self.demo_mode = False
         self.original_exam_start_time = None
         self.original_exam_end_time = None
         self.edit_mode = False
+        self.pre_config_choice = None
+        self.start_metrics()
+        self.lan = None
+        self.state_session = None
+        self.lan_settings = dict(LAN_DEFAULTS, **(self.store.get("lan") or {}))
         # Load configuration based on startup choice.
         if config_choice == "new":
             self.subject_info = self.get_subject_info()
@@ -203,12 +1769,13 @@ class FullScreenClockApp:
                 self.exam_date = pre_config.get("exam_date", self.exam_date)
                 self.exam_start_time = pre_config.get("exam_start_time")
                 self.exam_end_time = pre_config.get("exam_end_time")
-                self.subject_info = []
-                for code, name in pre_config.get("subject_info", []):
-                    rows = self.custom_simpledialog("Input", f"Enter the seat rows for {code} - {name}:")
-                    if not rows:
-                        rows = "No Rows Provided"
-                    self.subject_info.append((code, name, rows))
+                self.subject_info = [(code, name, rows or "No Rows Provided")
+                                     for code, name, rows in pre_config.get("subject_info", [])]
+                if any(not rows for _, _, rows in pre_config.get("subject_info", [])):
+                    # Fill in all the missing seat rows in one grid rather than one prompt per subject.
+                    self.subject_info = self.subject_grid_dialog(
+                        [(code, name, "" if rows == "No Rows Provided" else rows) for code, name, rows in self.subject_info],
+                        "Enter the seat rows for each subject:") or self.subject_info
             else:
                 self.subject_info = self.get_subject_info()
                 self.exam_start_time, self.exam_end_time = self.get_exam_times()
@@ -216,19 +1783,136 @@ class FullScreenClockApp:
             self.subject_info = self.get_subject_info()
             self.exam_start_time, self.exam_end_time = self.get_exam_times()
         self.save_configuration()
-        self.check_internet_and_time()
+        self.build_session()
+        self.init_styles()
+        self.setup_ui()
+        self.flash = FlashAnimation(self.root, self.set_clock_flash)
+        self.start_scheduler()
+        self.start_lan()
+        self.start_shared_state()
+        if self.pre_config_choice:
+            self.start_session_sequence(*self.pre_config_choice)
+    
+    def init_appearance(self):
+        # Adaptive font sizes, then any settings saved from the settings window.
+        large = self.root.winfo_screenwidth() >= 1280
+        self.appearance_defaults = dict(APPEARANCE_DEFAULTS, **{key: sizes[large] for key, sizes in FONT_SIZE_DEFAULTS.items()})
+        self.appearance = dict(self.appearance_defaults)
+        self.appearance.update(self.store.get("appearance") or {})
+        # Shared named fonts: every widget references these, so a size change is one configure() call.
+        def font(key, weight="normal"):
+            return tkfont.Font(root=self.root, family="Helvetica", size=self.appearance[key], weight=weight)
+        self.clock_font = font("clock_font_size", "bold")
+        self.info_font = font("info_font_size", "bold")
+        self.sub_header_font = font("sub_header_font_size")
+        self.custom_font = font("custom_font_size")
+        self.icon_font = font("icon_font_size")
+        self.subject_page_size = 12
+        self.subject_page_seconds = 10
+        for key in APPEARANCE_DEFAULTS:
+            setattr(self, key, self.appearance[key])
+    
+    def apply_appearance(self, appearance):
+        """Apply and save new settings; fonts change in place, so no widgets are rebuilt."""
+        previous, self.appearance = self.appearance, dict(self.appearance, **appearance)
+        for font, key in ((self.clock_font, "clock_font_size"), (self.info_font, "info_font_size"),
+                          (self.sub_header_font, "sub_header_font_size")):
+            if self.appearance[key] != previous[key]:
+                font.configure(size=self.appearance[key])
+        for key in APPEARANCE_DEFAULTS:
+            setattr(self, key, self.appearance[key])
+        self.main_frame.configure(bg=self.main_bg_color)
+        self.header_frame.configure(bg=self.header_bg_color)
+        self.exam_info_label.configure(bg=self.header_bg_color)
+        self.clock_frame.configure(bg=self.clock_bg_color)
+        self.clock.configure(self.clock_font, self.clock_fg_color, self.clock_bg_color)
+        if self.main_bg_color != previous["main_bg_color"]:
+            self.display_subject_info()
+        # Only overrides are saved, so unchanged font sizes keep following the screen width.
+        self.store.update(appearance={key: value for key, value in self.appearance.items()
+                                      if value != self.appearance_defaults.get(key)})
+    
+    def init_time_source(self, clock=None):
+        """System time, or a VirtualClock given here or configured under "virtual_time"."""
+        settings = dict(VIRTUAL_TIME_DEFAULTS, **(self.store.get("virtual_time") or {}))
+        if clock is None and (settings["start"] or float(settings["warp"]) != 1):
+            clock = VirtualClock.from_settings(settings["start"], settings["warp"])
+            print(f"Running on simulated time at {clock.warp:g}x")
+        self.time_source = TimeSource(clock=clock)
+        self.resync_requested = threading.Event()
+    
+    def init_styles(self):
         self.style = ttk.Style()
         self.style.theme_use("clam")
-        self.style.configure("custom.Horizontal.TProgressbar", troughcolor="#444444", background="#2ecc71")
-        self.setup_ui()
-        self.update_clock()
-        self.root.bind("<Escape>", self.exit_fullscreen)
+        # One style per band; a band change swaps the widget's style instead of reconfiguring the theme.
+        for band, color in PROGRESS_BANDS.items():
+            self.style.configure(f"{band}.Horizontal.TProgressbar", troughcolor="#444444", background=color)
+    
+    def start_metrics(self):
+        """Time the hot paths by shadowing them with recording wrappers before anything binds to them."""
+        settings = dict(METRICS_DEFAULTS, **(self.store.get("metrics") or {}))
+        self.metrics = Metrics(settings["samples"], settings["enabled"], self.current_time)
+        self.metrics.set_mode(self.power_mode)
+        self.metrics_path = os.path.join(application_path, settings["dump_path"])
+        for name in ("update_clock", "update_progress_bar", "check_alerts", "display_subject_info", "save_configuration"):
+            setattr(self, name, self.metrics.timed(name, getattr(self, name)))
+        profiler = dict(PROFILER_DEFAULTS, **(self.store.get("profiler") or {}))
+        self.profiler = RuntimeProfiler(self.root, os.path.join(application_path, profiler["directory"]),
+                                        profiler["duration"], profiler["top"], profiler["frames"])
+    
+    def toggle_profiling(self, notify=True):
+        if not self.profiler.running:
+            self.profiler.start()
+            if notify:
+                messagebox.showinfo("Profiling", f"Profiling started; it stops by itself after {self.profiler.duration} s.")
+            return
+        path = self.profiler.stop()
+        if notify:
+            messagebox.showinfo("Profiling", f"Report written to {path}." if path else "The report could not be written.")
+    
+    def show_metrics(self):
+        metrics_win = tk.Toplevel(self.root)
+        metrics_win.title("Performance Metrics")
+        metrics_win.configure(bg="#333333")
+        uptime = self.current_time() - self.metrics.started
+        text = (f"Uptime {uptime / 3600:.1f} h, {self.scheduler.skipped_seconds} second(s) skipped.\n\n"
+                + self.metrics.report())
+        text_widget = tk.Text(metrics_win, wrap="none", font=("Courier", 14), bg="#333333", fg="white",
+                              width=82, height=min(30, text.count("\n") + 2))
+        text_widget.insert("1.0", text)
+        text_widget.configure(state="disabled")
+        text_widget.pack(fill="both", expand=True, padx=10, pady=10)
+        button_frame = tk.Frame(metrics_win, bg="#333333")
+        button_frame.pack(fill="x", padx=10, pady=10)
+        tk.Button(button_frame, text="Save to File", font=self.custom_font, bg="#3498db", fg="white", relief="flat",
+                  command=lambda: self.metrics.dump(self.metrics_path)).pack(side="left", padx=10)
+        tk.Button(button_frame, text="Close", font=self.custom_font, bg="#e74c3c", fg="white", relief="flat",
+                  command=metrics_win.destroy).pack(side="right", padx=10)
     
-    def bind_double_click(self, widget, row_index):
-        """Recursively bind double-click events to widget and all its children."""
-        widget.bind("<Double-Button-1>", lambda e, idx=row_index: self.edit_subject_dialog(idx))
-        for child in widget.winfo_children():
-            self.bind_double_click(child, row_index)
+    def start_scheduler(self):
+        self.scheduler = TickScheduler(self.root, clock=self.current_time, on_skip=self.report_skipped_ticks,
+                                       metrics=self.metrics if self.metrics.enabled else None, rate=self.time_source.rate)
+        # Background workers (and the SIGUSR1 handler, hence the reentrant SimpleQueue) post
+        # (kind, payload) tuples here; they are handled on the Tk thread.
+        self.events = queue.SimpleQueue()
+        self.event_handlers = {"time_check": self.on_time_check, "sntp": self.on_sntp,
+                               "profile": lambda payload: self.toggle_profiling(notify=False)}
+        if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+            # kill -USR1 <pid> toggles profiling without touching the display.
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.events.put(("profile", None)))
+        self.scheduler.register(self.process_events)
+        self.scheduler.register(self.check_time_base)
+        self.scheduler.register(self.update_clock)
+        self.scheduler.register(self.update_progress_bar)
+        self.scheduler.register(self.check_alerts)
+        self.scheduler.register(self.next_subject_page, period=self.subject_page_seconds)
+        self.power_settings = dict(POWER_SAVE_DEFAULTS, **(self.store.get("power_save") or {}))
+        if self.power_settings["enabled"]:
+            self.scheduler.register(self.check_power_state)
+        self.scheduler.start()
+        self.start_status_server()
+        self.check_internet_and_time()
+        self.root.bind("<Escape>", self.exit_fullscreen)
     
     def setup_ui(self):
         self.main_frame = tk.Frame(self.root, bg=self.main_bg_color)
@@ -239,35 +1923,40 @@ class FullScreenClockApp:
         self.header_frame.columnconfigure(1, weight=0)
         self.header_frame.columnconfigure(2, weight=0)
         self.header_frame.columnconfigure(3, weight=0)
+        self.header_frame.columnconfigure(4, weight=0)
         exam_info_text = f"Date: {self.exam_date}    |    Exam Start: {self.exam_start_time}    |    Exam End: {self.exam_end_time}"
         self.exam_info_label = tk.Label(self.header_frame, text=exam_info_text,
                                         font=self.sub_header_font, fg="white", bg=self.header_bg_color)
         self.exam_info_label.grid(row=0, column=0, sticky="w", padx=10, pady=10)
+        seat_button = tk.Button(self.header_frame, text="🔍", command=self.open_seat_lookup,
+                                font=self.icon_font, bg="#16a085", fg="white", relief="flat")
+        seat_button.grid(row=0, column=1, sticky="e", padx=10, pady=10)
+        CreateToolTip(seat_button, "Seat Lookup")
         help_button = tk.Button(self.header_frame, text="❓", command=self.open_help_window,
                                  font=self.icon_font, bg="#8e44ad", fg="white", relief="flat")
-        help_button.grid(row=0, column=1, sticky="e", padx=10, pady=10)
+        help_button.grid(row=0, column=2, sticky="e", padx=10, pady=10)
         CreateToolTip(help_button, "Tutorial, Demo Mode & Edit Layout")
         settings_button = tk.Button(self.header_frame, text="⚙", command=self.open_settings_window,
                                     font=self.icon_font, bg="#3498db", fg="white", relief="flat")
-        settings_button.grid(row=0, column=2, sticky="e", padx=10, pady=10)
+        settings_button.grid(row=0, column=3, sticky="e", padx=10, pady=10)
         CreateToolTip(settings_button, "Settings")
         exit_button = tk.Button(self.header_frame, text="✖", command=self.exit_fullscreen,
                                 font=self.icon_font, bg="#e74c3c", fg="white", relief="flat")
-        exit_button.grid(row=0, column=3, sticky="e", padx=10, pady=10)
+        exit_button.grid(row=0, column=4, sticky="e", padx=10, pady=10)
         CreateToolTip(exit_button, "Exit")
         self.clock_frame = tk.Frame(self.main_frame, bg=self.clock_bg_color, bd=6, relief="ridge")
         self.clock_frame.pack(fill="both", expand=True, pady=10)
-        self.clock_label = tk.Label(self.clock_frame, text="",
-                                    font=self.clock_font, fg=self.clock_fg_color, bg=self.clock_bg_color)
-        self.clock_label.pack(expand=True)
+        self.clock = CanvasClock(self.clock_frame, self.clock_font, self.clock_fg_color, self.clock_bg_color)
+        self.clock.pack(expand=True)
         self.progress_frame = tk.Frame(self.main_frame, bg=self.main_bg_color)
         self.progress_frame.pack(fill="x", pady=10)
         self.progress = ttk.Progressbar(self.progress_frame, orient="horizontal",
                                         mode="determinate", maximum=100,
-                                        style="custom.Horizontal.TProgressbar")
+                                        style="normal.Horizontal.TProgressbar")
         self.progress.pack(fill="x", padx=20)
         self.subject_frame = tk.Frame(self.main_frame, bg=self.main_bg_color)
         self.subject_frame.pack(fill="x", pady=(10, 0))
+        self.subject_table = SubjectTable(self.subject_frame, self.edit_subject_dialog, page_size=self.subject_page_size)
         self.display_subject_info()
     
     def open_settings_window(self):
@@ -275,45 +1964,28 @@ class FullScreenClockApp:
         settings_win.title("Settings")
         settings_win.configure(bg="#333333")
         settings_win.grab_set()
-        labels = ["Clock Font Size:", "Info Font Size:", "Subheader Font Size:", "Flash Count:",
-                  "Flash Delay (ms):", "Main BG Color:", "Header BG Color:", "Clock FG Color:", "Clock BG Color:"]
-        current_values = [str(self.clock_font[1]), str(self.info_font[1]), str(self.sub_header_font[1]),
-                          str(self.flash_count), str(self.flash_delay), self.main_bg_color,
-                          self.header_bg_color, self.clock_fg_color, self.clock_bg_color]
+        fields = [("Clock Font Size:", "clock_font_size", int), ("Info Font Size:", "info_font_size", int),
+                  ("Subheader Font Size:", "sub_header_font_size", int), ("Flash Count:", "flash_count", int),
+                  ("Flash Delay (ms):", "flash_delay", int), ("Main BG Color:", "main_bg_color", str),
+                  ("Header BG Color:", "header_bg_color", str), ("Clock FG Color:", "clock_fg_color", str),
+                  ("Clock BG Color:", "clock_bg_color", str)]
         entries = {}
-        for i, (label_text, current) in enumerate(zip(labels, current_values)):
+        for i, (label_text, key, convert) in enumerate(fields):
             tk.Label(settings_win, text=label_text, font=self.custom_font, bg="#333333", fg="white").grid(row=i, column=0, padx=10, pady=5, sticky="e")
             entry = tk.Entry(settings_win, font=self.custom_font, width=20)
-            entry.insert(0, current)
+            entry.insert(0, str(self.appearance[key]))
             entry.grid(row=i, column=1, padx=10, pady=5, sticky="w")
-            entries[label_text] = entry
+            entries[key] = entry
         def save_settings():
             try:
-                clock_font_size = int(entries["Clock Font Size:"].get())
-                info_font_size = int(entries["Info Font Size:"].get())
-                sub_header_font_size = int(entries["Subheader Font Size:"].get())
-                self.clock_font = ("Helvetica", clock_font_size, "bold")
-                self.info_font = ("Helvetica", info_font_size, "bold")
-                self.sub_header_font = ("Helvetica", sub_header_font_size)
-                self.flash_count = int(entries["Flash Count:"].get())
-                self.flash_delay = int(entries["Flash Delay (ms):"].get())
-                self.main_bg_color = entries["Main BG Color:"].get()
-                self.header_bg_color = entries["Header BG Color:"].get()
-                self.clock_fg_color = entries["Clock FG Color:"].get()
-                self.clock_bg_color = entries["Clock BG Color:"].get()
-                self.main_frame.configure(bg=self.main_bg_color)
-                self.header_frame.configure(bg=self.header_bg_color)
-                self.exam_info_label.configure(font=self.sub_header_font, bg=self.header_bg_color)
-                self.clock_frame.configure(bg=self.clock_bg_color)
-                self.clock_label.configure(font=self.clock_font, fg=self.clock_fg_color, bg=self.clock_bg_color)
-                self.display_subject_info()
+                self.apply_appearance({key: convert(entries[key].get().strip()) for _, key, convert in fields})
             except Exception as e:
                 messagebox.showerror("Error", f"Error saving settings: {e}")
             settings_win.destroy()
         tk.Button(settings_win, text="Save", command=save_settings, font=self.custom_font,
-                  bg="#e74c3c", fg="white", relief="flat").grid(row=len(labels), column=0, padx=10, pady=10)
+                  bg="#e74c3c", fg="white", relief="flat").grid(row=len(fields), column=0, padx=10, pady=10)
         tk.Button(settings_win, text="Cancel", command=settings_win.destroy, font=self.custom_font,
-                  bg="#95a5a6", fg="white", relief="flat").grid(row=len(labels), column=1, padx=10, pady=10)
+                  bg="#95a5a6", fg="white", relief="flat").grid(row=len(fields), column=1, padx=10, pady=10)
     
     def open_help_window(self):
         help_win = tk.Toplevel(self.root)
@@ -338,6 +2010,11 @@ class FullScreenClockApp:
             "Edit Layout:\n"
             "Click the 'Toggle Edit Layout' button to enable drag-and-drop repositioning of the main UI panels.\n\n"
             "Double-click any subject row (including on the text) to edit its details directly.\n\n"
+            "Seat rows can list several ranges, e.g. \"1-10, 15, 20-25\". The 🔍 button finds the subject for a seat "
+            "and lists overlapping or uncovered seats.\n\n"
+            "Long subject lists are shown one page at a time and rotate automatically.\n\n"
+            "Performance Metrics shows how long the clock's regular work is taking; it is also saved to a file on exit.\n\n"
+            "Toggle Profiling records where time and memory go for a few minutes and saves a report, without stopping the clock.\n\n"
             "Hover over icons for additional information. Enjoy!"
         )
         text_widget = tk.Text(help_win, wrap="word", font=self.custom_font, bg="#333333", fg="white")
@@ -352,19 +2029,49 @@ class FullScreenClockApp:
         edit_button = tk.Button(button_frame, text="Toggle Edit Layout", font=self.custom_font,
                                 bg="#27ae60", fg="white", relief="flat", command=self.toggle_edit_mode)
         edit_button.pack(side="left", padx=10)
+        metrics_button = tk.Button(button_frame, text="Performance Metrics", font=self.custom_font,
+                                   bg="#8e44ad", fg="white", relief="flat", command=self.show_metrics)
+        metrics_button.pack(side="left", padx=10)
+        profile_button = tk.Button(button_frame, text="Toggle Profiling", font=self.custom_font,
+                                   bg="#d35400", fg="white", relief="flat", command=self.toggle_profiling)
+        profile_button.pack(side="left", padx=10)
         close_button = tk.Button(button_frame, text="Close", font=self.custom_font,
                                  bg="#e74c3c", fg="white", relief="flat", command=help_win.destroy)
         close_button.pack(side="right", padx=10)
     
+    def build_session(self):
+        """Resolve the exam times into an ExamSession; called whenever the times change."""
+        try:
+            self.session = ExamSession.from_strings(self.exam_date, self.exam_start_time, self.exam_end_time)
+        except (TypeError, ValueError) as e:
+            print("Invalid exam times:", e)
+            self.session = None
+        self.progress_band = None
+        self.compile_alerts()
+    
+    def compile_alerts(self):
+        self.alerts = self.make_alerts(self.session)
+        if self.scheduler is not None:
+            # The session changed: jobs sleeping until its old boundaries must look again.
+            self.scheduler.wake(self.update_progress_bar, self.check_alerts, self.check_power_state)
+    
+    def make_alerts(self, session):
+        settings = dict(ALERT_DEFAULTS, **(self.store.get("alerts") or {}))
+        return AlertTimeline(session, self.current_time(), settings["minutes_before_end"],
+                             settings["exam_end"], settings["half_hour_marks"], settings["catch_up"])
+    
     def toggle_demo_mode(self):
         if not self.demo_mode:
             self.demo_mode = True
-            now = datetime.now()
+            now = datetime.fromtimestamp(self.current_time())
             self.original_exam_start_time = self.exam_start_time
             self.original_exam_end_time = self.exam_end_time
             self.exam_start_time = now.strftime("%H:%M")
             demo_end = now + timedelta(minutes=2)
             self.exam_end_time = demo_end.strftime("%H:%M")
+            self.session = ExamSession(now.timestamp(), demo_end.timestamp())
+            self.progress_band = None
+            self.compile_alerts()
             new_info = f"Date: {self.exam_date}    |    Exam Start: {self.exam_start_time}    |    Exam End: {self.exam_end_time} (Demo Mode)"
             self.exam_info_label.config(text=new_info)
             messagebox.showinfo("Demo Mode", "Demo Mode Activated: Exam lasts 2 minutes.")
@@ -373,6 +2080,7 @@ class FullScreenClockApp:
             if self.original_exam_start_time and self.original_exam_end_time:
                 self.exam_start_time = self.original_exam_start_time
                 self.exam_end_time = self.original_exam_end_time
+            self.build_session()
             new_info = f"Date: {self.exam_date}    |    Exam Start: {self.exam_start_time}    |    Exam End: {self.exam_end_time}"
             self.exam_info_label.config(text=new_info)
             messagebox.showinfo("Demo Mode", "Demo Mode Deactivated.")
@@ -425,30 +2133,12 @@ class FullScreenClockApp:
                 writer.writerow(["Date", "ExamStart", "ExamEnd", "SubjectCode1", "SubjectName1"])
             messagebox.showinfo("Pre-Config Created", f"No pre-config CSV found.\nA new file has been created at:\n{PRE_CONFIG_CSV}\nPlease populate it with data and restart the app.")
             return None
-        configs = []
         try:
-            with open(PRE_CONFIG_CSV, newline="", encoding="utf-8") as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    conf = {}
-                    conf["exam_date"] = row.get("Date", "")
-                    conf["exam_start_time"] = row.get("ExamStart", "")
-                    conf["exam_end_time"] = row.get("ExamEnd", "")
-                    subjects = []
-                    for key in row:
-                        if key.startswith("SubjectCode"):
-                            index = key[len("SubjectCode"):]
-                            code = row[key]
-                            name_key = "SubjectName" + index
-                            name = row.get(name_key, "")
-                            if code and name:
-                                subjects.append((code, name))
-                    conf["subject_info"] = subjects
-                    configs.append(conf)
+            index = PreConfigIndex.load(PRE_CONFIG_CSV, PRE_CONFIG_CACHE)
         except Exception as e:
             messagebox.showerror("CSV Error", f"Error reading CSV file: {e}")
             return None
-        if not configs:
+        if not index.sessions:
             messagebox.showinfo("No Configs", "No configurations found in CSV.")
             return None
         select_win = tk.Toplevel(self.root)
@@ -459,39 +2149,113 @@ class FullScreenClockApp:
         tk.Label(select_win, text="Select a Pre-Configuration:", font=self.custom_font, bg="#333333", fg="white").pack(pady=10)
         listbox = tk.Listbox(select_win, font=self.custom_font, width=80)
         listbox.pack(pady=10, padx=10, fill="both", expand=True)
-        now = datetime.now()
-        best_index = 0
-        best_diff = None
-        for idx, conf in enumerate(configs):
-            try:
-                conf_date = datetime.strptime(conf["exam_date"], "%d-%b-%Y")
-                conf_time = datetime.strptime(conf["exam_start_time"], "%H:%M").time()
-                conf_datetime = datetime.combine(conf_date, conf_time)
-                diff = abs((conf_datetime - now).total_seconds())
-                if best_diff is None or diff < best_diff:
-                    best_diff = diff
-                    best_index = idx
-            except Exception:
-                pass
-        for idx, conf in enumerate(configs):
-            summary = f"{conf.get('exam_date','')} | Start: {conf.get('exam_start_time','')} | End: {conf.get('exam_end_time','')}"
-            listbox.insert(tk.END, summary)
-        listbox.select_set(best_index)
-        listbox.activate(best_index)
-        listbox.see(best_index)
+        now = self.current_time()
+        best_index = index.nearest(now)
+        shown = {"first": 0, "last": len(index.sessions), "job": None}
+        def populate(first, last):
+            """List sessions first..last, inserting in idle-time chunks so large timetables open instantly."""
+            if shown["job"]:
+                select_win.after_cancel(shown["job"])
+            shown.update(first=first, last=last, job=None)
+            listbox.delete(0, tk.END)
+            def insert_chunk(start):
+                shown["job"] = None
+                if not listbox.winfo_exists():
+                    return
+                stop = min(last, start + 200)
+                listbox.insert(tk.END, *[f"{exam_date} | Start: {exam_start} | End: {exam_end}" + (f" | {room}" if room else "")
+                                         for _, exam_date, exam_start, exam_end, _, room in index.sessions[start:stop]])
+                if start <= best_index < stop:
+                    listbox.select_set(best_index - first)
+                    listbox.activate(best_index - first)
+                    listbox.see(best_index - first)
+                if stop < last:
+                    shown["job"] = select_win.after_idle(insert_chunk, stop)
+            if first < last:
+                insert_chunk(first)
+        first, last = index.window(now, PRE_CONFIG_WINDOW_DAYS)
+        if first < last:
+            populate(first, last)
+        else:
+            populate(0, len(index.sessions))
         choice = {"value": None}
         def select_config():
             try:
-                index = listbox.curselection()[0]
+                position = shown["first"] + listbox.curselection()[0]
             except IndexError:
-                index = 0
-            choice["value"] = configs[index]
+                position = best_index
+            choice["value"] = PreConfigIndex.as_config(index.sessions[position])
+            self.pre_config_choice = (index, position)
             select_win.destroy()
-        tk.Button(select_win, text="Load", font=self.custom_font, bg="#2ecc71", fg="white",
-                  relief="flat", command=select_config).pack(pady=10)
+        button_frame = tk.Frame(select_win, bg="#333333")
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="Show All", font=self.custom_font, bg="#3498db", fg="white",
+                  relief="flat", command=lambda: populate(0, len(index.sessions))).pack(side="left", padx=10)
+        tk.Button(button_frame, text="Load", font=self.custom_font, bg="#2ecc71", fg="white",
+                  relief="flat", command=select_config).pack(side="left", padx=10)
         self.root.wait_window(select_win)
         return choice["value"]
     
+    def start_session_sequence(self, index, position):
+        """Queue the later sessions on the chosen session's day and in its room."""
+        settings = dict(SEQUENCE_DEFAULTS, **(self.store.get("sequence") or {}))
+        chosen = index.sessions[position]
+        if not settings["enabled"] or chosen[0] is None or self.session is None:
+            return
+        sessions = [(self.session, None)]
+        for session in index.sessions[position + 1:index.day(chosen[0])[1]]:
+            if session[5] != chosen[5]:
+                continue
+            config = PreConfigIndex.as_config(session)
+            try:
+                sessions.append((ExamSession.from_strings(config["exam_date"], config["exam_start_time"],
+                                                          config["exam_end_time"]), config))
+            except (TypeError, ValueError) as e:
+                print(f"Skipping session at {config['exam_start_time']}:", e)
+        self.sequence = SessionSequence(sessions, settings["handover"], settings["prebuild"])
+        self.next_subject_table = None
+        if self.sequence:
+            print(f"{len(self.sequence)} more session(s) today will follow automatically")
+            self.scheduler.register(self.advance_sessions)
+    
+    def advance_sessions(self, now=None):
+        for kind, config in self.sequence.due(self.current_time() if now is None else now):
+            if kind == "prebuild":
+                self.prebuild_session(config)
+            else:
+                self.switch_session(config)
+        return self.sequence.next_time()
+    
+    def prebuild_session(self, config):
+        """Render the next session's subject table into an unmapped frame, ready to swap in."""
+        if self.next_subject_table:
+            self.next_subject_table[2].destroy()
+        subject_info = sorted(((code, name, rows or "No Rows Provided") for code, name, rows in config["subject_info"]),
+                              key=seat_rows_sort_key)
+        frame = tk.Frame(self.main_frame, bg=self.main_bg_color)
+        table = SubjectTable(frame, self.edit_subject_dialog, page_size=self.subject_page_size)
+        table.render(subject_info, self.info_font, self.main_bg_color)
+        self.next_subject_table = (config, subject_info, frame, table)
+    
+    def switch_session(self, config):
+        if not self.next_subject_table or self.next_subject_table[0] is not config:
+            self.prebuild_session(config)
+        _, subject_info, frame, table = self.next_subject_table
+        self.next_subject_table = None
+        self.subject_frame.destroy()
+        frame.pack(fill="x", pady=(10, 0))
+        self.subject_frame, self.subject_table = frame, table
+        self.demo_mode = False
+        self.exam_date = config["exam_date"]
+        self.exam_start_time = config["exam_start_time"]
+        self.exam_end_time = config["exam_end_time"]
+        self.subject_info = list(subject_info)
+        self.index_seats()
+        self.exam_info_label.config(text=f"Date: {self.exam_date}    |    Exam Start: {self.exam_start_time}    |    Exam End: {self.exam_end_time}")
+        self.save_configuration()
+        self.build_session()
+        print(f"Switched to the {self.exam_start_time} - {self.exam_end_time} session")
+    
     def prompt_load_configuration(self):
         if os.path.exists(LOG_FILE):
             return messagebox.askyesno("Load Configuration", "Load the last saved configuration?")
@@ -499,33 +2263,19 @@ class FullScreenClockApp:
             return False
     
     def load_configuration(self):
-        try:
-            with open(LOG_FILE, "r") as file:
-                config = json.load(file)
-            return config
-        except (json.JSONDecodeError, FileNotFoundError):
+        if not self.store.loaded:
             messagebox.showwarning("Warning", "Could not load configuration. Starting fresh.")
             return {}
+        return {key: self.store.get(key) for key in ("subject_info", "exam_start_time", "exam_end_time")}
     
     def save_configuration(self):
-        subject_log = {}
-        if os.path.exists(LOG_FILE):
-            try:
-                with open(LOG_FILE, "r") as file:
-                    subject_log = json.load(file).get("subject_log", {})
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
-        for subject_code, subject_name, _ in self.subject_info:
-            if subject_code not in subject_log:
-                subject_log[subject_code] = subject_name
-        config = {
-            "subject_info": self.subject_info,
-            "subject_log": subject_log,
-            "exam_start_time": self.exam_start_time,
-            "exam_end_time": self.exam_end_time
-        }
-        with open(LOG_FILE, "w") as file:
-            json.dump(config, file)
+        self.subject_version = subject_list_version(self.subject_info)
+        self.store.remember_subjects(self.subject_info)
+        self.store.update(subject_info=[list(subject) for subject in self.subject_info],
+                          exam_start_time=self.exam_start_time,
+                          exam_end_time=self.exam_end_time)
+        if isinstance(self.lan, LanLeader):
+            self.lan.set_subjects(self.subject_info)
     
     def get_exam_times(self):
         exam_start = self.custom_simpledialog("Exam Time", "Enter the exam start time (HH:MM, 24-hour format):")
@@ -533,65 +2283,99 @@ class FullScreenClockApp:
         return exam_start, exam_end
     
     def get_subject_info(self):
-        subject_info = []
-        subject_log = {}
-        if os.path.exists(LOG_FILE):
-            try:
-                with open(LOG_FILE, "r") as file:
-                    config = json.load(file)
-                    subject_log = config.get("subject_log", {})
-            except (json.JSONDecodeError, FileNotFoundError):
-                messagebox.showwarning("Warning", "Subject log could not be loaded. Starting fresh.")
-        num_subjects = self.custom_simpledialog("Input", "Enter the number of subjects (or leave blank to skip):", is_integer=True)
-        if num_subjects is None or num_subjects <= 0:
-            return []
-        for _ in range(num_subjects):
-            if subject_log:
-                autocomplete_list = [f"{code} - {subject_log[code]}" for code in subject_log]
-                subject_code = self.custom_autocomplete_dialog("Input", "Enter the subject code:", autocomplete_list)
-            else:
-                subject_code = self.custom_simpledialog("Input", "Enter the subject code:")
-            if not subject_code:
-                continue
-            if subject_code in subject_log:
-                subject_name = subject_log[subject_code]
-            else:
-                subject_name = self.custom_simpledialog("Input", f"Enter the subject name for {subject_code}:")
-                subject_log[subject_code] = subject_name
-            seat_rows_prompt = f"Enter the seat rows for {subject_code} - {subject_name} (or leave blank):"
-            seat_rows = self.custom_simpledialog("Input", seat_rows_prompt)
-            subject_info.append((subject_code, subject_name, seat_rows if seat_rows else "No Rows Provided"))
-        return subject_info
-    
-    def custom_autocomplete_dialog(self, title, prompt, autocomplete_list, is_integer=False):
+        if self.store.load_error:
+            messagebox.showwarning("Warning", "Subject log could not be loaded. Starting fresh.")
+        return self.subject_grid_dialog() or []
+    
+    def subject_lookup(self):
+        """The subject log's index, backed by the course catalogue index when one has been imported."""
+        index = SubjectIndex(self.store.subject_log())
+        path = os.path.join(application_path, dict(CATALOGUE_DEFAULTS, **(self.store.get("catalogue") or {}))["path"])
+        if not os.path.exists(path):
+            return index
+        if self.catalogue is None or self.catalogue.path != path:
+            self.catalogue = CatalogueIndex(path)
+        return SubjectLookup(index, self.catalogue)
+
+    def subject_grid_dialog(self, subject_info=(), prompt=None):
+        """
+        Enter or edit every subject in one window: one subject per line (code, name, seat
+        rows, tab-separated), typed, pasted from a spreadsheet or imported from a CSV/TSV
+        file. Names of known codes are filled in from the subject log. Returns the new
+        subject_info, or None if cancelled.
+        """
+        subject_log = self.subject_lookup()
         dialog = tk.Toplevel(self.root)
-        dialog.title(title)
-        width, height = 800, 300
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-        x = (screen_width - width) // 2
-        y = (screen_height - height) // 2
-        dialog.geometry(f"{width}x{height}+{x}+{y}")
+        dialog.title("Subjects")
         dialog.configure(bg="#333333")
+        dialog.geometry(f"1000x700+{(self.root.winfo_screenwidth() - 1000) // 2}+{(self.root.winfo_screenheight() - 700) // 2}")
         dialog.attributes('-topmost', True)
-        tk.Label(dialog, text=prompt, font=self.custom_font, bg="#333333", fg="white", wraplength=750).pack(pady=20)
-        entry = AutocompleteEntry(dialog, autocomplete_list, font=self.custom_font, width=50)
-        entry.pack(pady=20)
-        dialog.after(10, lambda: entry.focus_set())
+        dialog.result = None
+        tk.Label(dialog, text=prompt or "One subject per line: code, name (optional for known codes), seat rows.\n"
+                 "Paste from a spreadsheet, import a CSV/TSV file, or add subjects below.",
+                 font=self.custom_font, bg="#333333", fg="white", justify="left").pack(padx=10, pady=10, anchor="w")
+        add_frame = tk.Frame(dialog, bg="#333333")
+        add_frame.pack(fill="x", padx=10)
+        tk.Label(add_frame, text="Code:", font=self.custom_font, bg="#333333", fg="white").pack(side="left")
+        code_entry = AutocompleteEntry(add_frame, subject_log, font=self.custom_font, width=14)
+        code_entry.pack(side="left", padx=5)
+        tk.Label(add_frame, text="Seat Rows:", font=self.custom_font, bg="#333333", fg="white").pack(side="left")
+        rows_entry = tk.Entry(add_frame, font=self.custom_font, width=14)
+        rows_entry.pack(side="left", padx=5)
+        text = tk.Text(dialog, font=self.custom_font, wrap="none", undo=True, tabs=(220, 720))
+        text.pack(fill="both", expand=True, padx=10, pady=10)
+        text.insert("1.0", "".join("\t".join(subject[:3]) + "\n" for subject in subject_info))
+        status = tk.Label(dialog, text="", font=self.custom_font, bg="#333333", fg="#f39c12", justify="left", anchor="w")
+        status.pack(fill="x", padx=10)
+        def check():
+            """Validate in one pass and show the grid with known names filled in; returns the result."""
+            rows = parse_subject_table(text.get("1.0", "end"))
+            result, errors, warnings = build_subject_info(rows, subject_log)
+            text.delete("1.0", "end")
+            text.insert("1.0", "".join(f"{code}\t{name}\t{'' if seat_rows == 'No Rows Provided' else seat_rows}\n"
+                                       for code, name, seat_rows in result))
+            summary = [f"{len(result)} subject(s)."] + errors + warnings
+            status.configure(text="\n".join(summary[:8]) + ("\n..." if len(summary) > 8 else ""),
+                             fg="#e74c3c" if errors else "#2ecc71")
+            return result, errors
+        def add_subject(event=None):
+            code = code_entry.get().strip()
+            if code:
+                code_entry.hide_listbox()
+                text.insert("end", f"{code}\t{subject_log.get(code, '')}\t{rows_entry.get().strip()}\n")
+                code_entry.delete(0, tk.END)
+                rows_entry.delete(0, tk.END)
+                code_entry.focus_set()
+        def import_file():
+            path = filedialog.askopenfilename(parent=dialog, title="Import Subjects",
+                                              filetypes=[("CSV/TSV files", "*.csv *.tsv *.txt"), ("All files", "*.*")])
+            if path:
+                try:
+                    with open(path, newline="", encoding="utf-8-sig") as file:
+                        text.insert("end", file.read())
+                except (OSError, UnicodeDecodeError) as e:
+                    messagebox.showerror("Import Error", f"Could not read {path}: {e}", parent=dialog)
+                    return
+                check()
         def on_ok():
-            dialog.result = entry.get()
-            dialog.destroy()
-        tk.Button(dialog, text="OK", command=on_ok, font=self.custom_font,
-                  bg="#e74c3c", fg="white", relief="flat", activebackground="#c0392b").pack(pady=10)
-        dialog.bind("<Return>", lambda event: on_ok())
+            result, errors = check()
+            if not errors:
+                dialog.result = result
+                dialog.destroy()
+        rows_entry.bind("<Return>", add_subject)
+        button_frame = tk.Frame(dialog, bg="#333333")
+        button_frame.pack(fill="x", padx=10, pady=10)
+        for label, command, color in (("Add", add_subject, "#16a085"), ("Import CSV/TSV...", import_file, "#3498db"),
+                                      ("Check", check, "#f39c12")):
+            tk.Button(button_frame, text=label, command=command, font=self.custom_font,
+                      bg=color, fg="white", relief="flat").pack(side="left", padx=5)
+        tk.Button(button_frame, text="Cancel", command=dialog.destroy, font=self.custom_font,
+                  bg="#95a5a6", fg="white", relief="flat").pack(side="right", padx=5)
+        tk.Button(button_frame, text="OK", command=on_ok, font=self.custom_font,
+                  bg="#e74c3c", fg="white", relief="flat", activebackground="#c0392b").pack(side="right", padx=5)
+        dialog.after(10, code_entry.focus_set)
         self.root.wait_window(dialog)
-        if is_integer:
-            try:
-                return int(dialog.result)
-            except (ValueError, TypeError):
-                return None
-        else:
-            return dialog.result.strip() if dialog.result else None
+        return dialog.result
     
     def custom_simpledialog(self, title, prompt, is_integer=False):
         dialog = tk.Toplevel(self.root)
@@ -624,35 +2408,53 @@ class FullScreenClockApp:
         else:
             return dialog.result.strip() if dialog.result else None
     
+    def next_subject_page(self, now=None):
+        self.subject_table.next_page(now)
+    
     def display_subject_info(self):
         self.sort_subjects_by_rows()
-        for widget in self.subject_frame.winfo_children():
-            widget.destroy()
-        header_frame = tk.Frame(self.subject_frame, bg=self.main_bg_color)
-        header_frame.pack(fill="x", pady=(0, 5))
-        tk.Label(header_frame, text="Code", font=self.info_font, fg="white", bg=self.main_bg_color)\
-            .grid(row=0, column=0, sticky="w", padx=10)
-        tk.Label(header_frame, text="Subject", font=self.info_font, fg="white", bg=self.main_bg_color)\
-            .grid(row=0, column=1, sticky="ew", padx=10)
-        tk.Label(header_frame, text="Rows", font=self.info_font, fg="white", bg=self.main_bg_color)\
-            .grid(row=0, column=2, sticky="e", padx=10)
-        header_frame.columnconfigure(0, weight=1)
-        header_frame.columnconfigure(1, weight=2)
-        header_frame.columnconfigure(2, weight=1)
-        for index, (subject_code, subject_name, seat_rows) in enumerate(self.subject_info):
-            row_frame = tk.Frame(self.subject_frame, bg="#333333", bd=1, relief="ridge")
-            row_frame.pack(fill="x", padx=10, pady=2)
-            # Bind double-click on the row and all its children.
-            self.bind_double_click(row_frame, index)
-            tk.Label(row_frame, text=subject_code, font=self.info_font, fg="white", bg="#333333")\
-                .grid(row=0, column=0, sticky="w", padx=10, pady=5)
-            tk.Label(row_frame, text=subject_name, font=self.info_font, fg="white", bg="#333333")\
-                .grid(row=0, column=1, sticky="ew", padx=10, pady=5)
-            tk.Label(row_frame, text=seat_rows, font=self.info_font, fg="white", bg="#333333")\
-                .grid(row=0, column=2, sticky="e", padx=10, pady=5)
-            row_frame.columnconfigure(0, weight=1)
-            row_frame.columnconfigure(1, weight=2)
-            row_frame.columnconfigure(2, weight=1)
+        self.index_seats()
+        self.subject_frame.configure(bg=self.main_bg_color)
+        self.subject_table.render(self.subject_info, self.info_font, self.main_bg_color)
+    
+    def index_seats(self):
+        subject_version = subject_list_version(self.subject_info)
+        if self.seat_index_version == subject_version:
+            return
+        self.seat_index = SeatIndex(self.subject_info)
+        self.seat_index_version = subject_version
+        for first, last, subjects in self.seat_index.overlaps():
+            print(f"Seat rows overlap at {SeatIndex.describe(first, last)}: " + ", ".join(subject[0] for subject in subjects))
+    
+    def open_seat_lookup(self):
+        lookup_win = tk.Toplevel(self.root)
+        lookup_win.title("Seat Lookup")
+        lookup_win.configure(bg="#333333")
+        self.index_seats()
+        tk.Label(lookup_win, text="Seat number:", font=self.custom_font, bg="#333333", fg="white").pack(padx=10, pady=(10, 5))
+        seat_var = tk.StringVar()
+        entry = tk.Entry(lookup_win, textvariable=seat_var, font=self.custom_font, width=10, justify="center")
+        entry.pack(padx=10, pady=5)
+        entry.focus_set()
+        result = tk.Label(lookup_win, text="", font=self.custom_font, bg="#333333", fg="#FFFF00", justify="left")
+        result.pack(padx=10, pady=10)
+        problems = [f"Overlap at {SeatIndex.describe(first, last)}: " + ", ".join(subject[0] for subject in subjects)
+                    for first, last, subjects in self.seat_index.overlaps()]
+        problems += [f"No subject at {SeatIndex.describe(first, last)}" for first, last in self.seat_index.gaps()]
+        if problems:
+            tk.Label(lookup_win, text="\n".join(problems[:10]), font=self.custom_font, bg="#333333", fg="#e74c3c",
+                     justify="left").pack(padx=10, pady=5)
+        def show(*args):
+            text = seat_var.get().strip()
+            if not text.isdigit():
+                result.configure(text="")
+                return
+            subjects = self.seat_index.lookup(int(text))
+            result.configure(text="\n".join(f"{code} - {name}" for code, name, *_ in subjects) or "No subject at this seat")
+        seat_var.trace_add("write", show)
+        tk.Button(lookup_win, text="Close", font=self.custom_font, bg="#e74c3c", fg="white", relief="flat",
+                  command=lookup_win.destroy).pack(pady=10)
+        lookup_win.bind("<Escape>", lambda event: lookup_win.destroy())
     
     def edit_subject_dialog(self, row_index):
         subject = self.subject_info[row_index]
@@ -696,92 +2498,448 @@ class FullScreenClockApp:
         dialog.bind("<Return>", lambda event: save_edit())
     
     def sort_subjects_by_rows(self):
-        def key_func(item):
-            rows = item[2]
-            try:
-                first_number = rows.split("-")[0].strip()
-                return int(first_number)
-            except (ValueError, IndexError):
-                return float('inf')
-        self.subject_info.sort(key=key_func)
+        self.subject_info.sort(key=seat_rows_sort_key)
     
     def is_internet_connected(self, host="8.8.8.8", port=53, timeout=3):
         try:
-            socket.create_connection((host, port), timeout)
-            return True
+            with socket.create_connection((host, port), timeout):
+                return True
         except OSError:
             return False
     
     def check_internet_and_time(self):
-        if not self.is_internet_connected():
-            prompt = ("Internet not connected.\nPlease verify your PC time.\nEnter the correct time (HH:MM:SS) if needed, or leave blank if correct:")
-            correct_time_str = self.custom_simpledialog("Time Check", prompt)
-            if correct_time_str:
-                try:
-                    h, m, s = map(int, correct_time_str.split(':'))
-                    desired_seconds = h * 3600 + m * 60 + s
-                    current_struct = time.localtime()
-                    current_seconds = current_struct.tm_hour * 3600 + current_struct.tm_min * 60 + current_struct.tm_sec
-                    self.time_offset = desired_seconds - current_seconds
-                except Exception:
-                    messagebox.showwarning("Invalid Time", "Time entered is invalid. Using system time.")
-                    self.time_offset = 0
-            else:
-                self.time_offset = 0
-        else:
-            self.time_offset = 0
+        """
+        Sync with SNTP, or probe connectivity if that fails, on a worker thread; the clock
+        keeps running on system time meanwhile. The thread then re-syncs every interval.
+        """
+        if self.lan_settings["role"] == "follower" or self.time_source.clock is not None:
+            # The leader is the time authority for followers; simulated time is never synced.
+            return
+        settings = dict(TIME_CHECK_DEFAULTS, **(self.store.get("time_check") or {}))
+        sntp = dict(SNTP_DEFAULTS, **(self.store.get("sntp") or {}))
+        self.time_source.slew_rate = float(sntp["slew_rate"])
+        self.time_source.max_slew = float(sntp["max_slew"])
+        client = None
+        if sntp["server"]:
+            client = SntpClient(sntp["server"], int(sntp["port"]), int(sntp["samples"]), float(sntp["timeout"]))
+        def sync():
+            try:
+                self.events.put(("sntp", client.measure()))
+                return True
+            except OSError as e:
+                print("SNTP sync failed:", e)
+                return False
+        def worker():
+            if client is None or not sync():
+                connected = self.is_internet_connected(settings["host"], int(settings["port"]), float(settings["timeout"]))
+                self.events.put(("time_check", connected))
+            while client is not None:
+                # Sleep until the next periodic sync, or until a discontinuity asks for one early.
+                self.resync_requested.wait(float(sntp["interval"]))
+                self.resync_requested.clear()
+                sync()
+        threading.Thread(target=worker, name="time-check", daemon=True).start()
     
-    def update_clock(self):
-        adjusted_time = time.localtime(time.time() + self.time_offset)
-        current_time_str = time.strftime("%H:%M:%S", adjusted_time)
-        self.clock_label.config(text=current_time_str)
-        self.update_progress_bar()
-        minutes = time.strftime("%M", adjusted_time)
-        seconds = time.strftime("%S", adjusted_time)
-        if minutes in ["00", "30"] and seconds == "00":
-            self.flash_clock()
-        self.root.after(1000, self.update_clock)
-    
-    def update_progress_bar(self):
+    def start_status_server(self):
+        settings = dict(STATUS_SERVER_DEFAULTS, **(self.store.get("status_server") or {}))
+        self.status_server = None
+        if not settings["enabled"]:
+            return
         try:
-            today = datetime.now().date()
-            exam_start = datetime.strptime(f"{today} {self.exam_start_time}", "%Y-%m-%d %H:%M")
-            exam_end = datetime.strptime(f"{today} {self.exam_end_time}", "%Y-%m-%d %H:%M")
-            now = datetime.fromtimestamp(time.time() + self.time_offset)
-            if now < exam_start:
-                progress = 0
-                time_left = (exam_end - exam_start).total_seconds()
-            elif now > exam_end:
-                progress = 100
-                time_left = 0
-            else:
-                total = (exam_end - exam_start).total_seconds()
-                elapsed = (now - exam_start).total_seconds()
-                progress = (elapsed / total) * 100
-                time_left = (exam_end - now).total_seconds()
-            self.progress["value"] = progress
-            if time_left <= 10 * 60:
-                color = "#e74c3c"
-            elif time_left <= 30 * 60:
-                color = "#f39c12"
-            else:
-                color = "#2ecc71"
-            self.style.configure("custom.Horizontal.TProgressbar", background=color)
-        except Exception as e:
-            print("Error updating progress bar:", e)
+            self.status_server = StatusServer(settings["host"], int(settings["port"]))
+        except OSError as e:
+            messagebox.showwarning("Status Server", f"Could not start the status server: {e}")
+            return
+        print(f"Status server listening on http://{settings['host']}:{self.status_server.port}/")
+        self.scheduler.register(self.publish_status)
+    
+    def publish_status(self, now=None):
+        if now is None:
+            now = self.current_time()
+        self.status_server.publish(self.status_snapshot(now))
+    
+    def status_snapshot(self, now):
+        snapshot = {"time": now, "time_text": time.strftime("%H:%M:%S", time.localtime(now)),
+                    "exam_date": self.exam_date, "exam_start_time": self.exam_start_time,
+                    "exam_end_time": self.exam_end_time, "demo": self.demo_mode,
+                    "subject_info": [list(subject) for subject in self.subject_info],
+                    "time_remaining": None, "progress": None, "band": None}
+        if self.session is not None:
+            progress, band = self.session.state(now)
+            snapshot.update(time_remaining=max(0.0, self.session.end - max(now, self.session.start)),
+                            progress=progress, band=band)
+        return snapshot
+    
+    def start_shared_state(self):
+        settings = dict(SHARED_STATE_DEFAULTS, **(self.store.get("shared_state") or {}))
+        self.state_writer = None
+        if not settings["enabled"]:
+            return
+        try:
+            self.state_writer = StateWriter(settings["path"])
+        except (OSError, ValueError) as e:
+            print("Could not open the shared state file:", e)
+            return
+        self.scheduler.register(self.publish_shared_state)
+    
+    def publish_shared_state(self, now=None):
+        if now is None:
+            now = self.current_time()
+        session = self.session
+        if session is None:
+            self.state_writer.write(now, 0.0, 0.0, 0.0, 0.0, None, self.demo_mode, b"", 0, self.subject_version)
+            return
+        if session is not self.state_session:
+            self.state_session = session
+            self.state_session_id = zlib.crc32(struct.pack("!dd", session.start, session.end))
+        progress, band = session.state(now)
+        self.state_writer.write(now, session.start, session.end, progress,
+                                max(0.0, session.end - max(now, session.start)), band, self.demo_mode,
+                                PROGRESS_BAND_BYTES[band], self.state_session_id, self.subject_version)
+    
+    def start_lan(self):
+        settings = self.lan_settings
+        try:
+            if settings["role"] == "leader":
+                self.lan = LanLeader(settings["group"], int(settings["port"]), settings["interface"], int(settings["ttl"]),
+                                     float(settings["reply_interval"]))
+                self.lan.set_subjects(self.subject_info)
+                self.scheduler.register(self.publish_lan)
+            elif settings["role"] == "follower":
+                self.lan = LanFollower(settings["group"], int(settings["port"]), self.events, settings["interface"],
+                                       float(settings["latency"]), float(settings["request_spread"]))
+                self.event_handlers["lan"] = self.on_lan_state
+                self.event_handlers["lan_subjects"] = self.on_lan_subjects
+        except OSError as e:
+            messagebox.showwarning("LAN Mode", f"Could not start LAN {settings['role']} mode: {e}")
+    
+    def publish_lan(self, now=None):
+        self.lan.publish(self.current_time() if now is None else now, self.session, self.demo_mode)
+    
+    def on_lan_state(self, state):
+        offset = state["offset"]
+        if not self.time_source.synced:
+            self.time_source.reanchor(offset, step=True, reason="LAN leader")
+            self.time_source.synced = True
+            self.on_time_step()
+        elif abs(offset - self.time_source.target) > 0.02:
+            self.time_source.reanchor(offset, reason="LAN leader")
+        start, end = state["start"], state["end"]
+        if not state["has_session"]:
+            return
+        if self.session is None or (self.session.start, self.session.end) != (start, end) or self.demo_mode != state["demo"]:
+            self.session = ExamSession(start, end)
+            self.progress_band = None
+            self.compile_alerts()
+            self.demo_mode = state["demo"]
+            self.exam_date = time.strftime("%d-%b-%Y", time.localtime(start))
+            self.exam_start_time = time.strftime("%H:%M", time.localtime(start))
+            self.exam_end_time = time.strftime("%H:%M", time.localtime(end))
+            new_info = f"Date: {self.exam_date}    |    Exam Start: {self.exam_start_time}    |    Exam End: {self.exam_end_time}"
+            self.exam_info_label.config(text=new_info + (" (Demo Mode)" if self.demo_mode else ""))
+    
+    def on_lan_subjects(self, subject_info):
+        self.subject_info = subject_info
+        self.display_subject_info()
+        self.save_configuration()
+    
+    def process_events(self, now=None):
+        while True:
+            try:
+                kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                return
+            handler = self.event_handlers.get(kind)
+            if handler:
+                handler(payload)
+    
+    def on_time_check(self, connected):
+        if not connected:
+            # Run the modal prompt outside the tick so the scheduler keeps its rhythm.
+            self.root.after_idle(self.prompt_time_offset)
+    
+    def on_sntp(self, result):
+        offset, delay = result
+        # The first sync may step the clock; later ones are slewed.
+        self.time_source.reanchor(offset, step=not self.time_source.synced, reason="SNTP")
+        if not self.time_source.synced:
+            self.time_source.synced = True
+            self.on_time_step()
+        print(f"SNTP offset {offset:+.3f} s (round trip {delay * 1000:.1f} ms)")
+    
+    def prompt_time_offset(self):
+        if self.time_source.synced:
+            return
+        prompt = ("Internet not connected.\nPlease verify your PC time.\nEnter the correct time (HH:MM:SS) if needed, or leave blank if correct:")
+        correct_time_str = self.custom_simpledialog("Time Check", prompt)
+        if correct_time_str:
+            try:
+                h, m, s = map(int, correct_time_str.split(':'))
+                desired_seconds = h * 3600 + m * 60 + s
+                current_struct = time.localtime()
+                current_seconds = current_struct.tm_hour * 3600 + current_struct.tm_min * 60 + current_struct.tm_sec
+                self.time_source.reanchor(desired_seconds - current_seconds, step=True, reason="manual entry")
+                self.on_time_step()
+            except Exception:
+                messagebox.showwarning("Invalid Time", "Time entered is invalid. Using system time.")
+    
+    def on_time_step(self):
+        """
+        After a deliberate clock step: restart the tick count, and recompile the alerts,
+        which were dropped or kept as stale against the uncorrected time.
+        """
+        self.scheduler.resync()
+        self.compile_alerts()
+    
+    def current_time(self):
+        return self.time_source.now()
+    
+    def check_time_base(self, now=None):
+        event = self.time_source.check()
+        if event:
+            kind, seconds = event
+            print(f"Time discontinuity detected: {kind} of {seconds:+.1f} s; display kept on the monotonic anchor")
+            # Re-anchor at the next SNTP sync point rather than silently following the OS clock.
+            self.resync_requested.set()
+    
+    def report_skipped_ticks(self, missed, lateness):
+        if self.time_source.rate != 1:
+            # Under time warp Tk cannot keep up with every simulated second; that is expected.
+            return
+        print(f"Clock skipped {missed} second(s); tick was {lateness * 1000:.0f} ms late")
+    
+    def sessions(self):
+        return [self.session] if self.session is not None else []
+    
+    def check_power_state(self, now=None):
+        """Switch between active and idle around each session; returns when the mode next changes."""
+        if now is None:
+            now = self.current_time()
+        margin = self.power_settings["margin"]
+        active_until = next_start = math.inf
+        for session in self.sessions():
+            if session.start - margin <= now < session.end + margin:
+                active_until = min(active_until, session.end + margin)
+            elif now < session.start - margin:
+                next_start = min(next_start, session.start - margin)
+        mode = "active" if active_until < math.inf else "idle"
+        if mode != self.power_mode:
+            print(f"Power mode: {mode}")
+            self.power_mode = mode
+            self.metrics.set_mode(mode)
+            self.scheduler.wake(self.update_clock)
+        return active_until if mode == "active" else next_start
+    
+    def update_clock(self, now=None):
+        if now is None:
+            now = self.current_time()
+        adjusted_time = time.localtime(now)
+        if self.power_mode == "idle" and self.power_settings["idle_hide_seconds"]:
+            self.clock.show(time.strftime("%H:%M", adjusted_time))
+            return int(now) - adjusted_time.tm_sec + 60
+        current_time_str = time.strftime("%H:%M:%S", adjusted_time)
+        self.clock.show(current_time_str)
+    
+    def check_alerts(self, now=None):
+        if now is None:
+            now = self.current_time()
+        if self.alerts.heap and self.alerts.heap[0][0] <= now:
+            events = self.alerts.due(now)
+            for when, kind, label in events:
+                print(f"Alert at {time.strftime('%H:%M:%S', time.localtime(when))}: {label}")
+            if events:
+                self.flash_clock()
+        return self.alerts.heap[0][0] if self.alerts.heap else math.inf
+    
+    def update_progress_bar(self, now=None):
+        if self.session is None:
+            return math.inf
+        if now is None:
+            now = self.current_time()
+        progress, band = self.session.state(now)
+        self.progress["value"] = progress
+        if band != self.progress_band:
+            self.progress_band = band
+            self.progress.configure(style=f"{band}.Horizontal.TProgressbar")
+        # Pinned at 0 or 100 outside the session: sleep until it starts, or until the session changes.
+        if now < self.session.start:
+            return self.session.start
+        if now >= self.session.end:
+            return math.inf
     
     def flash_clock(self):
-        for i in range(self.flash_count):
-            self.root.after(self.flash_delay * i, lambda i=i: self.clock_label.config(fg='red' if i % 2 == 0 else self.clock_fg_color))
+        self.flash.start(self.flash_count, self.flash_delay)
+    
+    def set_clock_flash(self, flashing):
+        self.clock.set_color('red' if flashing else self.clock_fg_color)
     
     def exit_fullscreen(self, event=None):
         self.root.attributes('-fullscreen', False)
         self.root.quit()
 
+class RoomView:
+    """One room's read-only display in its own Toplevel, driven by MultiRoomApp's shared tick."""
+    def __init__(self, app, config, position):
+        self.app = app
+        self.config = config
+        self.name = config.get("room") or f"Room {position + 1}"
+        self.subject_info = sorted(((code, name, rows or "No Rows Provided") for code, name, rows in config["subject_info"]),
+                                   key=seat_rows_sort_key)
+        try:
+            self.session = ExamSession.from_strings(config["exam_date"], config["exam_start_time"], config["exam_end_time"])
+        except (TypeError, ValueError) as e:
+            print(f"Invalid exam times for {self.name}:", e)
+            self.session = None
+        self.progress_band = None
+        self.window = tk.Toplevel(app.root)
+        self.window.title(f"Exam Clock - {self.name}")
+        self.window.configure(bg=app.main_bg_color)
+        # Tk cannot enumerate monitors; rooms are laid out left to right, one screen width apart.
+        self.window.geometry(f"+{position * app.root.winfo_screenwidth()}+0")
+        self.window.attributes('-fullscreen', True)
+        self.window.bind("<Escape>", app.exit_fullscreen)
+        self.window.protocol("WM_DELETE_WINDOW", app.exit_fullscreen)
+        main_frame = tk.Frame(self.window, bg=app.main_bg_color)
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        header = (f"{self.name}    |    Date: {config['exam_date']}    |    "
+                  f"Exam Start: {config['exam_start_time']}    |    Exam End: {config['exam_end_time']}")
+        tk.Label(main_frame, text=header, font=app.sub_header_font, fg="white",
+                 bg=app.header_bg_color, anchor="w", padx=10, pady=10).pack(fill="x", pady=(0, 10))
+        clock_frame = tk.Frame(main_frame, bg=app.clock_bg_color, bd=6, relief="ridge")
+        clock_frame.pack(fill="both", expand=True, pady=10)
+        self.clock = CanvasClock(clock_frame, app.clock_font, app.clock_fg_color, app.clock_bg_color)
+        self.clock.pack(expand=True)
+        self.progress = ttk.Progressbar(main_frame, orient="horizontal", mode="determinate", maximum=100,
+                                        style="normal.Horizontal.TProgressbar")
+        self.progress.pack(fill="x", padx=20, pady=10)
+        subject_frame = tk.Frame(main_frame, bg=app.main_bg_color)
+        subject_frame.pack(fill="x", pady=(10, 0))
+        self.subject_table = SubjectTable(subject_frame, lambda index: None, page_size=app.subject_page_size)
+        self.subject_table.render(self.subject_info, app.info_font, app.main_bg_color)
+        self.alerts = app.make_alerts(self.session)
+        self.flash = FlashAnimation(self.window, self.set_clock_flash)
+    def show_time(self, text):
+        self.clock.show(text)
+    def update_progress(self, now):
+        if self.session is None:
+            return
+        progress, band = self.session.state(now)
+        self.progress["value"] = progress
+        if band != self.progress_band:
+            self.progress_band = band
+            self.progress.configure(style=f"{band}.Horizontal.TProgressbar")
+    def check_alerts(self, now):
+        if self.alerts.heap and self.alerts.heap[0][0] <= now and self.alerts.due(now):
+            self.flash.start(self.app.flash_count, self.app.flash_delay)
+    def set_clock_flash(self, flashing):
+        self.clock.set_color('red' if flashing else self.app.clock_fg_color)
+
+
+class MultiRoomApp(FullScreenClockApp):
+    """
+    Hosts one RoomView per room found in today's pre-config sessions, all in one process.
+    The time source, config store, styles and scheduler are shared: each tick formats
+    the time once and fans it out to every room.
+    """
+    def __init__(self, root, clock=None):
+        self.root = root
+        self.root.withdraw()
+        self.store = ConfigStore(LOG_FILE)
+        self.init_appearance()
+        self.init_time_source(clock)
+        self.start_metrics()
+        self.lan_settings = dict(LAN_DEFAULTS, role=None)
+        self.demo_mode = False
+        self.init_styles()
+        self.rooms = [RoomView(self, config, position) for position, config in enumerate(self.load_room_configs())]
+        if not self.rooms:
+            messagebox.showinfo("Multi-Room", "No sessions for today were found in the pre-config CSV.")
+            self.root.after_idle(self.exit_fullscreen)
+            return
+        self.start_scheduler()
+    
+    def load_room_configs(self):
+        """For each room with a session today, the session starting nearest to now."""
+        if not os.path.exists(PRE_CONFIG_CSV):
+            return []
+        try:
+            index = PreConfigIndex.load(PRE_CONFIG_CSV, PRE_CONFIG_CACHE)
+        except Exception as e:
+            messagebox.showerror("CSV Error", f"Error reading CSV file: {e}")
+            return []
+        now = self.current_time()
+        first, last = index.day(now)
+        best = {}
+        for position in range(first, last):
+            session = index.sessions[position]
+            # Without a Room column every session is its own room.
+            room = session[5] or f"Session {position - first + 1}"
+            if room not in best or abs(session[0] - now) < abs(best[room][0] - now):
+                best[room] = session
+        configs = []
+        for room in sorted(best):
+            config = PreConfigIndex.as_config(best[room])
+            config["room"] = room
+            configs.append(config)
+        return configs
+    
+    def update_clock(self, now=None):
+        if now is None:
+            now = self.current_time()
+        text = time.strftime("%H:%M:%S", time.localtime(now))
+        for room in self.rooms:
+            room.show_time(text)
+    
+    def sessions(self):
+        return [room.session for room in self.rooms if room.session is not None]
+    
+    def compile_alerts(self):
+        for room in self.rooms:
+            room.alerts = self.make_alerts(room.session)
+        if self.scheduler is not None:
+            self.scheduler.wake(self.update_progress_bar, self.check_alerts, self.check_power_state)
+    
+    def update_progress_bar(self, now=None):
+        if now is None:
+            now = self.current_time()
+        for room in self.rooms:
+            room.update_progress(now)
+    
+    def check_alerts(self, now=None):
+        if now is None:
+            now = self.current_time()
+        for room in self.rooms:
+            room.check_alerts(now)
+    
+    def next_subject_page(self, now=None):
+        for room in self.rooms:
+            room.subject_table.next_page(now)
+    
+    def status_snapshot(self, now):
+        rooms = []
+        for room in self.rooms:
+            entry = {"room": room.name, "exam_date": room.config["exam_date"],
+                     "exam_start_time": room.config["exam_start_time"], "exam_end_time": room.config["exam_end_time"],
+                     "subject_info": [list(subject) for subject in room.subject_info],
+                     "time_remaining": None, "progress": None, "band": None}
+            if room.session is not None:
+                progress, band = room.session.state(now)
+                entry.update(time_remaining=max(0.0, room.session.end - max(now, room.session.start)),
+                             progress=progress, band=band)
+            rooms.append(entry)
+        return {"time": now, "time_text": time.strftime("%H:%M:%S", time.localtime(now)), "rooms": rooms}
+
+
 if __name__ == "__main__":
     root = tk.Tk()
     startup_choice = show_startup_menu(root, font=("Helvetica", 20))
     print("Startup choice:", startup_choice)
-    root.deiconify()
-    app = FullScreenClockApp(root, config_choice=startup_choice)
+    if startup_choice == "rooms":
+        app = MultiRoomApp(root)
+    else:
+        root.deiconify()
+        app = FullScreenClockApp(root, config_choice=startup_choice)
     root.mainloop()
+    app.store.close()
+    if app.metrics.enabled:
+        app.metrics.dump(app.metrics_path)
@@ -0,0 +1,235 @@
+"""
+Headless benchmarks for the exam clock's hot paths.
+
+Runs without a display (using examclock_headless) and writes machine-readable JSON
+so results can be compared across commits:
+
+    python examclock_bench.py --output bench.json
+    python examclock_bench.py --quick
+
+Each result reports per-call timings in microseconds (mean, p50, p95, min, max).
+"""
+import argparse, csv, json, os, platform, random, string, subprocess, sys, tempfile, time
+from datetime import datetime, timedelta
+
+import examclock
+import examclock_headless as headless
+from examclock_catalogue import CatalogueIndex
+
+
+def timings(samples_ns):
+    samples = sorted(samples_ns)
+    def percentile(p):
+        return samples[min(len(samples) - 1, int(p * len(samples)))] / 1000
+    return {"n": len(samples), "mean_us": sum(samples) / len(samples) / 1000, "p50_us": percentile(0.5),
+            "p95_us": percentile(0.95), "min_us": samples[0] / 1000, "max_us": samples[-1] / 1000}
+
+
+def measure(func, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - start)
+    return timings(samples)
+
+
+def random_code(rng):
+    return "".join(rng.choices(string.ascii_uppercase, k=3)) + "".join(rng.choices(string.digits, k=4))
+
+
+def make_subjects(count, rng):
+    return [(f"{random_code(rng)}{n}", f"SUBJECT NAME {n}", f"{n * 10 + 1} - {n * 10 + 10}") for n in range(count)]
+
+
+def make_catalogue(count, rng):
+    words = ["INTRODUCTION", "ADVANCED", "MATHEMATICS", "PHYSICS", "ECONOMICS", "FRENCH", "LAW", "DESIGN",
+             "CHEMISTRY", "HISTORY", "BIOLOGY", "STATISTICS", "I", "II", "III"]
+    catalogue = {}
+    while len(catalogue) < count:
+        catalogue[random_code(rng)] = " ".join(rng.choices(words, k=3))
+    return catalogue
+
+
+def session_around(now):
+    start = datetime.fromtimestamp(now) - timedelta(hours=1)
+    return start.strftime("%H:%M"), (start + timedelta(hours=3)).strftime("%H:%M")
+
+
+def bench_tick(results, repeat):
+    start, end = session_around(time.time())
+    with headless.headless_app(make_subjects(10, random.Random(1)), start, end) as app:
+        def tick():
+            now = app.current_time()
+            app.update_clock(now)
+            app.update_progress_bar(now)
+            app.check_alerts(now)
+        results["tick.update_clock+update_progress_bar+check_alerts"] = measure(tick, repeat)
+        results["tick.scheduler_full"] = measure(app.scheduler.tick, repeat, setup=app.scheduler.resync)
+
+
+def bench_subject_table(results, repeat, sizes):
+    rng = random.Random(2)
+    for size in sizes:
+        subjects = make_subjects(size, rng)
+        with headless.headless_app(subjects[:1]) as app:
+            def first_render():
+                app.subject_info = list(subjects)
+                app.display_subject_info()
+            def reset():
+                for row in list(app.subject_table.rows.values()) + app.subject_table.spare:
+                    row.frame.destroy()
+                app.subject_table.rows.clear()
+                app.subject_table.spare.clear()
+                app.subject_table.order = []
+            results[f"display_subject_info.initial.{size}"] = measure(first_render, repeat, setup=reset)
+            edited = list(subjects)
+            def edit_one():
+                index = rng.randrange(len(edited))
+                code, name, rows = edited[index]
+                edited[index] = (code, name + "*", rows)
+                app.subject_info = list(edited)
+                app.display_subject_info()
+            results[f"display_subject_info.after_edit.{size}"] = measure(edit_one, repeat)
+
+
+def bench_autocomplete(results, repeat, sizes):
+    rng = random.Random(3)
+    for size in sizes:
+        catalogue = make_catalogue(size, rng)
+        start = time.perf_counter_ns()
+        index = examclock.SubjectIndex(catalogue)
+        results[f"autocomplete.build.{size}"] = timings([time.perf_counter_ns() - start])
+        entry = examclock.AutocompleteEntry.__new__(examclock.AutocompleteEntry)
+        entry.index = index
+        entry.max_results = 50
+        entry.var = headless.FakeVar()
+        codes = list(catalogue)
+        def typing():
+            code = rng.choice(codes)
+            index.reset()
+            for length in range(1, 5):
+                entry.var.value = code[:length]
+                entry.comparison()
+        results[f"autocomplete.comparison_4_keystrokes.{size}"] = measure(typing, repeat)
+        def name_query():
+            entry.var.value = rng.choice(["math", "phys", "intro", "ec"])
+            index.reset()
+            entry.comparison()
+        results[f"autocomplete.comparison_name.{size}"] = measure(name_query, repeat)
+
+
+def bench_catalogue(results, repeat, sizes):
+    rng = random.Random(6)
+    directory = tempfile.mkdtemp(prefix="examclock-bench-")
+    for size in sizes:
+        path, database = os.path.join(directory, f"catalogue_{size}.csv"), os.path.join(directory, f"catalogue_{size}.sqlite")
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Course Code", "Course Title"])
+            writer.writerows(make_catalogue(size, rng).items())
+        index = CatalogueIndex(database)
+        start = time.perf_counter_ns()
+        index.import_csv(path)
+        result = timings([time.perf_counter_ns() - start])
+        result["rows_per_second"] = size / (result["mean_us"] / 1e6)
+        result["file_kib"] = os.path.getsize(database) // 1024
+        results[f"catalogue.import.{size}"] = result
+        lookup = examclock.SubjectLookup(examclock.SubjectIndex(make_catalogue(100, rng)), index)
+        codes = [value.split(" - ")[0] for value in index.search("A", 1000)]
+        def typing():
+            code = rng.choice(codes)
+            lookup.reset()
+            for length in range(1, 5):
+                lookup.search(code[:length])
+        results[f"catalogue.search_4_keystrokes.{size}"] = measure(typing, repeat)
+        results[f"catalogue.search_name.{size}"] = measure(
+            lambda: lookup.search(rng.choice(["math", "phys", "intro", "ec"])), repeat)
+        index.close()
+
+
+def write_pre_config(path, rows, rng):
+    day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Date", "ExamStart", "ExamEnd", "Room"] +
+                        [f"Subject{kind}{n}" for n in range(1, 6) for kind in ("Code", "Name")])
+        for _ in range(rows):
+            date = (day + timedelta(days=rng.randrange(60))).strftime("%d-%b-%Y")
+            start = rng.choice(["09:00", "14:00"])
+            subjects = []
+            for _ in range(5):
+                subjects += [random_code(rng), "SUBJECT NAME"]
+            writer.writerow([date, start, "11:00" if start == "09:00" else "16:00", f"Hall {rng.randrange(20)}"] + subjects)
+
+
+def bench_pre_config(results, repeat, sizes):
+    rng = random.Random(4)
+    directory = tempfile.mkdtemp(prefix="examclock-bench-")
+    for size in sizes:
+        path = os.path.join(directory, f"pre_config_{size}.csv")
+        cache = path + ".cache.json"
+        write_pre_config(path, size, rng)
+        def cold():
+            examclock.PreConfigIndex.loaded.clear()
+            if os.path.exists(cache):
+                os.remove(cache)
+            examclock.PreConfigIndex.load(path, cache)
+        cold_result = measure(cold, repeat)
+        cold_result["rows_per_second"] = size / (cold_result["mean_us"] / 1e6)
+        results[f"pre_config.parse.{size}"] = cold_result
+        def disk_cache():
+            examclock.PreConfigIndex.loaded.clear()
+            examclock.PreConfigIndex.load(path, cache)
+        results[f"pre_config.disk_cache.{size}"] = measure(disk_cache, repeat)
+        index = examclock.PreConfigIndex.load(path, cache)
+        now = time.time()
+        results[f"pre_config.nearest.{size}"] = measure(lambda: index.nearest(now), repeat * 10)
+
+
+def bench_save_configuration(results, repeat, sizes):
+    rng = random.Random(5)
+    for size in sizes:
+        with headless.headless_app(make_subjects(10, rng), subject_log=make_catalogue(size, rng)) as app:
+            results[f"save_configuration.tk_thread.{size}"] = measure(app.save_configuration, repeat)
+            results[f"save_configuration.background_write.{size}"] = measure(app.store.write, max(1, repeat // 10))
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the exam clock's hot paths.")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--repeat", type=int, default=200, help="timed calls per benchmark")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer repeats, for a smoke run")
+    args = parser.parse_args(argv)
+    repeat = 20 if args.quick else args.repeat
+    results = {}
+    bench_tick(results, repeat)
+    bench_subject_table(results, repeat, [10, 100] if args.quick else [10, 100, 1000])
+    bench_autocomplete(results, repeat, [1000, 10000] if args.quick else [1000, 10000, 100000])
+    bench_catalogue(results, repeat, [10000] if args.quick else [10000, 100000])
+    bench_pre_config(results, max(1, repeat // 20), [1000] if args.quick else [1000, 10000, 50000])
+    bench_save_configuration(results, repeat, [100, 1000] if args.quick else [100, 1000, 5000])
+    report = {"meta": {"commit": git_commit(), "timestamp": datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "repeat": repeat, "quick": args.quick},
+              "results": results}
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
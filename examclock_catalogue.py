@@ -0,0 +1,184 @@
+"""
+The registry's course catalogue as an on-disk SQLite index for subject autocomplete.
+
+The exam clock queries the index lazily, one LIMITed range scan per keystroke, so a
+catalogue of 100k+ courses costs nothing at startup and is never held in memory.
+Build or refresh it from a CSV export (streamed row by row, in batches):
+
+    python examclock_catalogue.py import courses.csv [--db subject_catalogue.sqlite]
+    python examclock_catalogue.py search econ
+
+The importer finds the code and name columns from the header (or takes the first two
+columns), normalizes codes (no spaces, upper case) and names (single spaces), and keeps
+the last row seen for a repeated code.
+"""
+import argparse, csv, os, sqlite3, sys, time
+
+DEFAULT_CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "subject_catalogue.sqlite")
+IMPORT_BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subjects (key TEXT PRIMARY KEY, code TEXT NOT NULL, name TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS suffixes (suffix TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (suffix, key)) WITHOUT ROWID;
+"""
+
+
+def normalize_code(code):
+    return "".join(code.split()).upper()
+
+
+def normalize_name(name):
+    return " ".join(name.split())
+
+
+def name_suffixes(name):
+    """Every word-suffix of the case-folded name, so "econ" finds "BASIC ECONOMETRICS"."""
+    words = name.casefold().split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def find_columns(header, code_column=None, name_column=None):
+    """(code, name) column positions from a header row, or None if it does not look like one."""
+    folded = [cell.strip().casefold() for cell in header]
+    def position(wanted, hints):
+        if wanted is not None:
+            return folded.index(wanted.casefold()) if wanted.casefold() in folded else None
+        return next((i for i, cell in enumerate(folded) if any(hint in cell for hint in hints)), None)
+    code = position(code_column, ("code",))
+    name = position(name_column, ("name", "title", "description"))
+    return (code, name) if code is not None and name is not None and code != name else None
+
+
+class CatalogueIndex:
+    """
+    Subject codes and names in SQLite, with the same search/get interface as the
+    in-memory SubjectIndex. Codes and name word-suffixes are case-folded primary keys,
+    so a prefix search is an index range scan.
+    """
+    def __init__(self, path=DEFAULT_CATALOGUE_PATH):
+        self.path = path
+        self.connection = None
+        self.count = None
+    def connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path)
+            self.connection.executescript(SCHEMA)
+        return self.connection
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+    def __len__(self):
+        if self.count is None:
+            self.count = self.connect().execute("SELECT COUNT(*) FROM subjects").fetchone()[0]
+        return self.count
+    def __contains__(self, code):
+        return self.get(code) is not None
+    def get(self, code, default=None):
+        row = self.connect().execute("SELECT name FROM subjects WHERE key = ?", (normalize_code(code).casefold(),)).fetchone()
+        return row[0] if row else default
+    def reset(self):
+        pass
+    def search(self, prefix, limit=50):
+        """Return up to limit "CODE - Name" suggestions, code matches first."""
+        folded = prefix.casefold()
+        if not folded:
+            return []
+        connection = self.connect()
+        upper = folded + "\U0010ffff"
+        results = [f"{code} - {name}" for code, name in connection.execute(
+            "SELECT code, name FROM subjects WHERE key >= ? AND key < ? ORDER BY key LIMIT ?", (folded, upper, limit))]
+        if len(results) < limit:
+            seen = set(results)
+            for code, name in connection.execute(
+                    "SELECT subjects.code, subjects.name FROM suffixes JOIN subjects ON subjects.key = suffixes.key "
+                    "WHERE suffix >= ? AND suffix < ? ORDER BY suffix LIMIT ?", (folded, upper, limit * 2)):
+                value = f"{code} - {name}"
+                if value not in seen:
+                    seen.add(value)
+                    results.append(value)
+                    if len(results) >= limit:
+                        break
+        return results
+    def add(self, code, name):
+        self.store([(code, name)])
+        self.connect().commit()
+    def store(self, pairs):
+        """Insert or replace (code, name) pairs in the current transaction; returns how many were stored."""
+        batch = {}
+        for code, name in pairs:
+            code, name = normalize_code(code), normalize_name(name)
+            if code and name:
+                batch[code.casefold()] = (code, name)
+        connection = self.connect()
+        replaced = []
+        for key in batch:
+            row = connection.execute("SELECT name FROM subjects WHERE key = ?", (key,)).fetchone()
+            if row:
+                replaced.extend((suffix, key) for suffix in name_suffixes(row[0]))
+        connection.executemany("DELETE FROM suffixes WHERE suffix = ? AND key = ?", replaced)
+        connection.executemany("INSERT OR REPLACE INTO subjects (key, code, name) VALUES (?, ?, ?)",
+                               [(key, code, name) for key, (code, name) in batch.items()])
+        connection.executemany("INSERT OR IGNORE INTO suffixes (suffix, key) VALUES (?, ?)",
+                               [(suffix, key) for key, (_, name) in batch.items() for suffix in name_suffixes(name)])
+        self.count = None
+        return len(batch)
+    def import_csv(self, csv_path, code_column=None, name_column=None, batch_size=IMPORT_BATCH):
+        """Stream a catalogue CSV into the index in one transaction; returns (rows read, codes stored)."""
+        rows_read = 0
+        connection = self.connect()
+        with open(csv_path, newline="", encoding="utf-8-sig") as file:
+            reader = csv.reader(file)
+            first = next(reader, None)
+            if first is None:
+                return 0, 0
+            columns = find_columns(first, code_column, name_column)
+            if columns is None:
+                if code_column or name_column:
+                    raise ValueError(f"Columns {code_column!r}/{name_column!r} not found in the header")
+                columns, pending = (0, 1), [first]
+            else:
+                pending = []
+            code_at, name_at = columns
+            width = max(columns)
+            try:
+                with connection:
+                    for row in reader:
+                        pending.append(row)
+                        if len(pending) >= batch_size:
+                            rows_read += len(pending)
+                            self.store((row[code_at], row[name_at]) for row in pending if len(row) > width)
+                            pending = []
+                    rows_read += len(pending)
+                    self.store((row[code_at], row[name_at]) for row in pending if len(row) > width)
+            finally:
+                self.count = None
+        return rows_read, len(self)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the exam clock's subject catalogue index.")
+    parser.add_argument("--db", default=DEFAULT_CATALOGUE_PATH, help="catalogue index file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="import a catalogue CSV (code and name columns)")
+    importer.add_argument("csv_path")
+    importer.add_argument("--code-column", help="header of the code column (default: first containing 'code')")
+    importer.add_argument("--name-column", help="header of the name column (default: first containing 'name'/'title')")
+    search = commands.add_parser("search", help="show the suggestions autocomplete would offer")
+    search.add_argument("prefix")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+    index = CatalogueIndex(args.db)
+    try:
+        if args.command == "import":
+            started = time.perf_counter()
+            rows, stored = index.import_csv(args.csv_path, args.code_column, args.name_column)
+            print(f"Read {rows} rows in {time.perf_counter() - started:.1f} s; {stored} subjects in {args.db}")
+        else:
+            print("\n".join(index.search(args.prefix, args.limit)) or "No matches")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,310 @@
+"""
+A display-free stand-in for the parts of tkinter the exam clock uses, for running
+the app's hot paths in benchmarks and soak tests on machines without a display.
+
+Widgets record their options and children but draw nothing. FakeRoot keeps its own
+after() queue, driven explicitly with run_until() against a clock the caller chooses.
+Any widget method the stand-in does not model is accepted and ignored.
+
+    with headless_app(subject_info) as app:
+        app.update_clock()
+"""
+import contextlib, heapq, itertools, json, os, shutil, tempfile, time, types, weakref
+from collections import Counter
+
+import examclock
+
+END = "end"
+live_widgets = weakref.WeakSet()
+calls = Counter()
+
+
+class FakeVar:
+    def __init__(self, master=None, value="", name=None):
+        self.value = value
+        self.traces = []
+    def get(self):
+        return self.value
+    def set(self, value):
+        self.value = value
+        for callback in self.traces:
+            callback("", "", "w")
+    def trace(self, mode, callback):
+        self.traces.append(callback)
+    trace_add = trace
+
+
+class TclError(Exception):
+    pass
+
+
+class FakeWidget:
+    result = None
+    def __init__(self, master=None, *args, **options):
+        self.master = master
+        self.options = dict(options)
+        self.children = []
+        self.items = []
+        self.bindings = {}
+        self.alive = True
+        self.mapped = False
+        if master is not None:
+            master.children.append(self)
+        live_widgets.add(self)
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        def ignored(*args, **kwargs):
+            calls[name] += 1
+        return ignored
+    def __getitem__(self, key):
+        return self.options.get(key, "")
+    def __setitem__(self, key, value):
+        self.configure(**{key: value})
+    def cget(self, key):
+        return self.options.get(key, "")
+    def configure(self, **options):
+        calls["configure"] += 1
+        self.options.update(options)
+    config = configure
+    def pack(self, **options):
+        calls["pack"] += 1
+        self.mapped = True
+    grid = place = pack
+    def pack_forget(self):
+        calls["pack_forget"] += 1
+        self.mapped = False
+    grid_forget = place_forget = pack_forget
+    def bind(self, sequence, callback, add=None):
+        self.bindings[sequence] = callback
+    def unbind(self, sequence, funcid=None):
+        self.bindings.pop(sequence, None)
+    def winfo_children(self):
+        return list(self.children)
+    def winfo_exists(self):
+        return self.alive
+    def winfo_screenwidth(self):
+        return 1920
+    def winfo_screenheight(self):
+        return 1080
+    def winfo_x(self):
+        return 0
+    winfo_y = winfo_width = winfo_height = winfo_rootx = winfo_rooty = winfo_x
+    def root(self):
+        widget = self
+        while widget.master is not None:
+            widget = widget.master
+        return widget
+    def after(self, ms, func=None, *args):
+        return self.root().after(ms, func, *args)
+    def after_idle(self, func, *args):
+        return self.root().after(0, func, *args)
+    def after_cancel(self, after_id):
+        self.root().after_cancel(after_id)
+    def wait_window(self, window=None):
+        pass
+    def destroy(self):
+        calls["destroy"] += 1
+        for child in list(self.children):
+            child.destroy()
+        if self.master is not None and self in self.master.children:
+            self.master.children.remove(self)
+        self.alive = False
+        live_widgets.discard(self)
+    # Entry, Listbox and Text content.
+    def insert(self, index, *values):
+        calls["insert"] += 1
+        self.items.extend(values)
+    def delete(self, first, last=None):
+        calls["delete"] += 1
+        self.items = []
+    def get(self, *args):
+        return "".join(self.items) if not args else (self.items[args[0]] if args[0] < len(self.items) else "")
+    def curselection(self):
+        return ()
+
+
+class FakeRoot(FakeWidget):
+    """The root window; owns the after() queue, ordered by due time on self.clock()."""
+    def __init__(self, clock=time.monotonic):
+        super().__init__(None)
+        self.clock = clock
+        self.queue = []
+        self.queued = set()
+        self.cancelled = set()
+        self.ids = itertools.count(1)
+        self.tk = types.SimpleNamespace(call=self.tcl_call, splitlist=tuple)
+    def tcl_call(self, *args):
+        """Just enough of the Tcl interpreter for "after info"."""
+        if args == ("after", "info"):
+            return tuple(after_id for after_id in self.queued)
+        raise TclError(f"unsupported Tcl command: {args}")
+    def root(self):
+        return self
+    def after(self, ms, func=None, *args):
+        after_id = f"after#{next(self.ids)}"
+        heapq.heappush(self.queue, (self.clock() + ms / 1000.0, after_id, func, args))
+        self.queued.add(after_id)
+        return after_id
+    def after_cancel(self, after_id):
+        if after_id in self.queued:
+            self.queued.discard(after_id)
+            self.cancelled.add(after_id)
+    def pending(self):
+        return len(self.queued)
+    def next_due(self):
+        while self.queue and self.queue[0][1] in self.cancelled:
+            self.cancelled.discard(heapq.heappop(self.queue)[1])
+        return self.queue[0][0] if self.queue else None
+    def run_until(self, deadline, advance=None):
+        """
+        Run callbacks due up to deadline on self.clock(). advance(t), if given, moves a
+        virtual clock forward to each callback's due time before it runs.
+        """
+        ran = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > deadline:
+                return ran
+            _, after_id, func, args = heapq.heappop(self.queue)
+            self.queued.discard(after_id)
+            if advance is not None:
+                advance(due)
+            func(*args)
+            ran += 1
+
+
+class FakeCanvas(FakeWidget):
+    """Keeps canvas items as option dicts so renderers can be checked without drawing."""
+    def __init__(self, master=None, *args, **options):
+        super().__init__(master, *args, **options)
+        self.canvas_items = {}
+        self.item_ids = itertools.count(1)
+    def create_text(self, x, y, **options):
+        calls["create_text"] += 1
+        item = next(self.item_ids)
+        self.canvas_items[item] = dict(options, coords=(x, y))
+        return item
+    def find_withtag(self, tag):
+        if tag in self.canvas_items:
+            return (tag,)
+        return tuple(item for item, options in self.canvas_items.items() if tag in str(options.get("tags", "")).split())
+    def itemconfigure(self, tag, **options):
+        calls["itemconfigure"] += 1
+        for item in self.find_withtag(tag):
+            self.canvas_items[item].update(options)
+    itemconfig = itemconfigure
+    def delete(self, *tags):
+        calls["delete"] += 1
+        for tag in tags:
+            for item in (list(self.canvas_items) if tag == "all" else self.find_withtag(tag)):
+                del self.canvas_items[item]
+
+
+class FakeFont:
+    """Fixed-pitch font metrics derived from the point size."""
+    def __init__(self, root=None, font=None, name=None, exists=False, **options):
+        family, size, *style = font if font else ("Helvetica", options.get("size", 12))
+        self.options = dict(family=family, size=size, weight="bold" if "bold" in style else "normal")
+        self.options.update(options)
+    def measure(self, text, displayof=None):
+        return int(len(text) * abs(self.options["size"]) * 0.6)
+    def metrics(self, *options, **kw):
+        size = abs(self.options["size"])
+        values = {"ascent": int(size * 0.9), "descent": int(size * 0.3), "linespace": int(size * 1.2), "fixed": 0}
+        return values[options[0]] if len(options) == 1 else values
+    def configure(self, **options):
+        calls["font_configure"] += 1
+        self.options.update(options)
+    config = configure
+    def cget(self, option):
+        return self.options.get(option)
+    def actual(self, option=None):
+        return self.options.get(option) if option else dict(self.options)
+
+
+class FakeAutocompleteEntry(FakeWidget):
+    """AutocompleteEntry derives from the real tk.Entry, so dialogs get this plain entry instead."""
+    def __init__(self, master, index, *args, max_results=50, debounce_ms=80, listbox_width=50, **options):
+        super().__init__(master, *args, **options)
+        self.index = index
+    def hide_listbox(self):
+        pass
+
+
+class FakeStyle:
+    def __init__(self, *args, **kwargs):
+        self.styles = {}
+    def theme_use(self, name=None):
+        return "clam"
+    def configure(self, style, **options):
+        calls["style_configure"] += 1
+        self.styles.setdefault(style, {}).update(options)
+
+
+def fake_tk():
+    """Namespaces standing in for the tkinter, ttk, messagebox and tkinter.font modules."""
+    widgets = {name: type(name, (FakeWidget,), {}) for name in
+               ("Frame", "Label", "Button", "Entry", "Listbox", "Text", "Toplevel", "Scrollbar")}
+    tk = types.SimpleNamespace(Tk=FakeRoot, StringVar=FakeVar, IntVar=FakeVar, END=END, LEFT="left",
+                               SOLID="solid", TclError=TclError, Canvas=FakeCanvas, **widgets)
+    ttk = types.SimpleNamespace(Style=FakeStyle, Progressbar=type("Progressbar", (FakeWidget,), {}))
+    def answer(*args, **kwargs):
+        calls["messagebox"] += 1
+        return True
+    messagebox = types.SimpleNamespace(showinfo=answer, showwarning=answer, showerror=answer, askyesno=answer)
+    tkfont = types.SimpleNamespace(Font=FakeFont)
+    return tk, ttk, messagebox, tkfont
+
+
+@contextlib.contextmanager
+def patched_tk():
+    """Swap examclock's tkinter modules for the stand-ins while the block runs."""
+    saved = examclock.tk, examclock.ttk, examclock.messagebox, examclock.tkfont, examclock.AutocompleteEntry
+    examclock.tk, examclock.ttk, examclock.messagebox, examclock.tkfont = fake_tk()
+    examclock.AutocompleteEntry = FakeAutocompleteEntry
+    try:
+        yield
+    finally:
+        examclock.tk, examclock.ttk, examclock.messagebox, examclock.tkfont, examclock.AutocompleteEntry = saved
+
+
+HEADLESS_CONFIG = {
+    "sntp": {"server": None},
+    "time_check": {"host": "127.0.0.1", "port": 9, "timeout": 0.05},
+    "shared_state": {"enabled": False},
+    "status_server": {"enabled": False},
+}
+
+
+@contextlib.contextmanager
+def headless_app(subject_info=(), exam_start_time="09:00", exam_end_time="12:00", subject_log=None,
+                 root=None, config=None, clock=None):
+    """
+    A FullScreenClockApp built on the stand-ins, loading the "last" configuration from a
+    temporary subject_log.json so no dialogs, network probes or shared files are involved.
+    With a VirtualClock, the root's after() queue runs on its simulated monotonic time.
+    """
+    directory = tempfile.mkdtemp(prefix="examclock-")
+    saved_paths = examclock.LOG_FILE, examclock.PRE_CONFIG_CSV, examclock.PRE_CONFIG_CACHE
+    examclock.LOG_FILE = os.path.join(directory, "subject_log.json")
+    examclock.PRE_CONFIG_CSV = os.path.join(directory, "pre_config.csv")
+    examclock.PRE_CONFIG_CACHE = os.path.join(directory, "pre_config.cache.json")
+    data = dict(HEADLESS_CONFIG, catalogue={"path": os.path.join(directory, "subject_catalogue.sqlite")})
+    data.update(config or {})
+    data.update(subject_info=[list(subject) for subject in subject_info], subject_log=subject_log or {},
+                exam_start_time=exam_start_time, exam_end_time=exam_end_time)
+    with open(examclock.LOG_FILE, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    app = None
+    try:
+        with patched_tk():
+            if root is None:
+                root = FakeRoot(clock.monotonic) if clock else FakeRoot()
+            app = examclock.FullScreenClockApp(root, "last", clock=clock)
+            yield app
+    finally:
+        if app is not None:
+            app.store.close()
+        examclock.LOG_FILE, examclock.PRE_CONFIG_CSV, examclock.PRE_CONFIG_CACHE = saved_paths
+        shutil.rmtree(directory, ignore_errors=True)
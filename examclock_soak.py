@@ -0,0 +1,126 @@
+"""
+Soak test: runs the exam clock headlessly on simulated time through a long stretch
+(a full day by default, across midnight) and samples memory, pending Tk after
+callbacks, live widgets and per-tick cost as it goes, so slow leaks show up in
+minutes instead of during a real exam.
+
+    python examclock_soak.py --hours 24 --output soak.json
+    python examclock_soak.py --hours 6 --start "2024-06-03 06:00" --strict
+
+Between samples it opens and closes the help, settings, metrics and edit windows
+and hovers a tooltip, the way invigilators do.
+"""
+import argparse, gc, json, random, sys, time, tracemalloc
+from datetime import datetime
+
+import examclock
+import examclock_headless as headless
+from examclock_bench import git_commit, make_subjects
+
+# Growth from the warm-up sample to the end beyond these counts is reported as a possible leak.
+GROWTH_TOLERANCE = {"pending_after": 2, "live_widgets": 5, "toplevels": 0}
+MEMORY_TOLERANCE_KIB = 1024
+
+
+def exercise_ui(app, clock):
+    """Open and close the app's windows and hover a tooltip; anything they leave behind is a leak."""
+    before = set(app.root.children)
+    button = next(widget for widget in app.header_frame.children if "<Enter>" in widget.bindings)
+    button.bindings["<Enter>"](None)
+    app.root.run_until(clock.monotonic() + 1, advance=clock.advance_to)
+    button.bindings["<Leave>"](None)
+    app.open_help_window()
+    app.open_settings_window()
+    app.show_metrics()
+    app.edit_subject_dialog(0)
+    for window in set(app.root.children) - before:
+        window.destroy()
+
+
+def count_toplevels(root):
+    count, stack = 0, [root]
+    while stack:
+        children = stack.pop().children
+        count += sum(1 for child in children if isinstance(child, examclock.tk.Toplevel))
+        stack.extend(children)
+    return count
+
+
+def sample(app, clock, previous_ticks):
+    ticks = app.metrics.histograms.get("tick.jobs")
+    count, total = (ticks.count, ticks.total) if ticks else (0, 0.0)
+    new_count, new_total = count - previous_ticks[0], total - previous_ticks[1]
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    return (count, total), {
+        "time": datetime.fromtimestamp(clock.time()).isoformat(timespec="seconds"),
+        "traced_kib": current // 1024, "peak_kib": peak // 1024, "gc_objects": len(gc.get_objects()),
+        "pending_after": app.root.pending(), "live_widgets": len(headless.live_widgets),
+        "toplevels": count_toplevels(app.root), "ticks": new_count,
+        "tick_mean_us": new_total / new_count * 1000 if new_count else None,
+        "tick_max_us": ticks.max * 1000 if ticks else None,
+    }
+
+
+def find_growth(samples):
+    """Possible leaks: steady growth between the warm-up sample (a quarter in) and the last one."""
+    if len(samples) < 4:
+        return []
+    baseline, last = samples[len(samples) // 4], samples[-1]
+    warnings = [f"{key} grew from {baseline[key]} to {last[key]}" for key, tolerance in GROWTH_TOLERANCE.items()
+                if last[key] - baseline[key] > tolerance]
+    if last["traced_kib"] - baseline["traced_kib"] > MEMORY_TOLERANCE_KIB:
+        warnings.append(f"traced memory grew from {baseline['traced_kib']} KiB to {last['traced_kib']} KiB")
+    return warnings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the exam clock headlessly through a simulated day.")
+    parser.add_argument("--hours", type=float, default=24, help="simulated hours to run")
+    parser.add_argument("--start", default=None, help='simulated start, "YYYY-MM-DD HH:MM" (default 06:00 today)')
+    parser.add_argument("--exam", default="09:00-12:00", help="exam window, HH:MM-HH:MM")
+    parser.add_argument("--subjects", type=int, default=30, help="subjects in the table")
+    parser.add_argument("--sample-minutes", type=float, default=30, help="simulated minutes between samples")
+    parser.add_argument("--no-exercise", action="store_true", help="do not open and close windows between samples")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 if possible leaks are found")
+    args = parser.parse_args(argv)
+    clock = examclock.VirtualClock.from_settings(args.start or "06:00", 0)
+    exam_start, exam_end = args.exam.split("-")
+    step = args.sample_minutes * 60
+    samples = []
+    started = time.perf_counter()
+    tracemalloc.start()
+    with headless.headless_app(make_subjects(args.subjects, random.Random(1)), exam_start, exam_end, clock=clock) as app:
+        end = clock.monotonic() + args.hours * 3600
+        ticks, first = sample(app, clock, (0, 0.0))
+        samples.append(first)
+        while clock.monotonic() < end:
+            deadline = min(end, clock.monotonic() + step)
+            app.root.run_until(deadline, advance=clock.advance_to)
+            clock.advance_to(deadline)
+            if not args.no_exercise:
+                exercise_ui(app, clock)
+            ticks, result = sample(app, clock, ticks)
+            samples.append(result)
+            print(f"{result['time']}  {result['traced_kib']:>7} KiB  after={result['pending_after']:<3} "
+                  f"widgets={result['live_widgets']:<4} toplevels={result['toplevels']:<2} ticks={result['ticks']:<5} "
+                  f"tick={result['tick_mean_us'] or 0:.0f} us", file=sys.stderr)
+    tracemalloc.stop()
+    warnings = find_growth(samples)
+    for warning in warnings:
+        print("Possible leak:", warning, file=sys.stderr)
+    report = {"meta": {"commit": git_commit(), "python": sys.version.split()[0], "hours": args.hours,
+                       "start": samples[0]["time"], "exam": args.exam, "subjects": args.subjects,
+                       "exercise": not args.no_exercise, "real_seconds": time.perf_counter() - started},
+              "samples": samples, "warnings": warnings}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    print(f"Simulated {args.hours:g} h in {report['meta']['real_seconds']:.1f} s; "
+          f"{len(warnings)} possible leak(s)", file=sys.stderr)
+    return 1 if warnings and args.strict else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,110 @@
+"""
+Live exam clock state shared through a fixed-layout memory-mapped file.
+
+The exam clock writes one record per tick; signage players, recorder overlays and
+other local processes can poll it at any rate with StateReader, without parsing
+subject_log.json. Writes are guarded by a seqlock: the sequence number is odd while
+a write is in progress, and a reader retries until it sees the same even number
+before and after copying the fields.
+
+Run this module to print the live state once per second:
+    python examclock_state.py [path]
+"""
+import mmap, os, stat, struct, sys, tempfile, time
+from collections import namedtuple
+
+DEFAULT_STATE_PATH = os.path.join(tempfile.gettempdir(), "examclock_state.bin")
+STATE_MAGIC = b"EXST"
+STATE_VERSION = 1
+BANDS = ("normal", "warning", "critical")
+NO_BAND = 255
+
+# magic, layout version, reserved
+HEADER = struct.Struct("<4sHH")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = HEADER.size
+# corrected time, exam start, exam end, progress, seconds remaining,
+# band index, demo flag, band colour, session id, subject table version
+PAYLOAD = struct.Struct("<dddddBB8sII")
+PAYLOAD_OFFSET = SEQUENCE_OFFSET + SEQUENCE.size
+STATE_SIZE = PAYLOAD_OFFSET + PAYLOAD.size
+
+ExamState = namedtuple("ExamState", "sequence time start end progress time_remaining band demo color session_id subject_version")
+
+
+class StateWriter:
+    """
+    Publishes the clock state into the mapped file; only the exam clock should write.
+    The default path is in the shared temp directory, so the file is opened without
+    following symlinks and must be a regular file owned by this user before it is
+    truncated; otherwise another user could redirect the writes to one of our files.
+    """
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o644)
+        try:
+            info = os.fstat(fd)
+            if not stat.S_ISREG(info.st_mode) or (hasattr(os, "getuid") and info.st_uid != os.getuid()):
+                raise OSError(f"{path} is not a regular file owned by this user")
+            os.ftruncate(fd, STATE_SIZE)
+            self.map = mmap.mmap(fd, STATE_SIZE)
+        finally:
+            os.close(fd)
+        self.sequence = 0
+        SEQUENCE.pack_into(self.map, SEQUENCE_OFFSET, self.sequence)
+        HEADER.pack_into(self.map, 0, STATE_MAGIC, STATE_VERSION, 0)
+    def write(self, now, start, end, progress, time_remaining, band, demo, color, session_id, subject_version):
+        self.sequence += 1
+        SEQUENCE.pack_into(self.map, SEQUENCE_OFFSET, self.sequence)
+        PAYLOAD.pack_into(self.map, PAYLOAD_OFFSET, now, start, end, progress, time_remaining,
+                          BANDS.index(band) if band in BANDS else NO_BAND, 1 if demo else 0,
+                          color, session_id, subject_version)
+        self.sequence += 1
+        SEQUENCE.pack_into(self.map, SEQUENCE_OFFSET, self.sequence)
+    def close(self):
+        self.map.close()
+
+
+class StateReader:
+    """Reads consistent snapshots from the mapped file without locking the writer."""
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), STATE_SIZE, access=mmap.ACCESS_READ)
+        magic, version, _ = HEADER.unpack_from(self.map, 0)
+        if magic != STATE_MAGIC or version != STATE_VERSION:
+            self.map.close()
+            raise ValueError(f"{path} is not an exam clock state file (version {STATE_VERSION})")
+    def sequence(self):
+        """The current sequence number; unchanged means nothing new to read."""
+        return SEQUENCE.unpack_from(self.map, SEQUENCE_OFFSET)[0]
+    def read(self, retries=1000):
+        """Return an ExamState, or None if the writer kept the record busy for every retry."""
+        for _ in range(retries):
+            before = SEQUENCE.unpack_from(self.map, SEQUENCE_OFFSET)[0]
+            if before % 2:
+                continue
+            fields = PAYLOAD.unpack_from(self.map, PAYLOAD_OFFSET)
+            if SEQUENCE.unpack_from(self.map, SEQUENCE_OFFSET)[0] == before:
+                now, start, end, progress, remaining, band, demo, color, session_id, subject_version = fields
+                return ExamState(before, now, start, end, progress, remaining,
+                                 BANDS[band] if band < len(BANDS) else None, bool(demo),
+                                 color.rstrip(b"\0").decode("ascii", "replace"), session_id, subject_version)
+        return None
+    def close(self):
+        self.map.close()
+
+
+if __name__ == "__main__":
+    reader = StateReader(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATE_PATH)
+    try:
+        while True:
+            state = reader.read()
+            if state:
+                print(time.strftime("%H:%M:%S", time.localtime(state.time)),
+                      f"{state.progress:5.1f}%", state.band, f"{state.time_remaining:.0f}s left",
+                      f"session {state.session_id:08x}", f"subjects v{state.subject_version:08x}")
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()